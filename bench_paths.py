@@ -0,0 +1,59 @@
+"""
+Path planner benchmark.
+
+Times bfs_path() and weighted_path() on random obstacle layouts and checks
+that, with every cell costing 1, the weighted search finds paths exactly as
+long as BFS (and a path whenever BFS does).
+
+Usage: python bench_paths.py [layouts]
+"""
+import random
+import sys
+import time
+
+from fuzzywarehouse.core.grid import EMPTY, OBSTACLE, Grid
+from fuzzywarehouse.core.pathfinding import MOVES, bfs_path, weighted_path
+
+COLS, ROWS = 30, 20
+QUERIES = 10  # Start/goal pairs per layout
+
+
+def follows(grid, start, goal, path):
+    """True if the moves lead from start to goal over empty cells (the goal may be occupied)"""
+    x, y = start
+    for d in path:
+        x, y = x + MOVES[d][0], y + MOVES[d][1]
+        if (x, y) != goal and grid.get(x, y) != EMPTY:
+            return False
+    return (x, y) == goal
+
+
+def main():
+    layouts = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rng = random.Random(1)
+    bfs_time = weighted_time = 0.0
+    queries = found = 0
+    for _ in range(layouts):
+        grid = Grid(COLS, ROWS, 1)
+        for _ in range(rng.randrange(COLS * ROWS // 2)):
+            grid.set(rng.randrange(COLS), rng.randrange(ROWS), OBSTACLE)
+        free = [(x, y) for y in range(ROWS) for x in range(COLS) if grid.get(x, y) == EMPTY]
+        for _ in range(QUERIES):
+            start, goal = rng.choice(free), rng.choice(free)
+            t = time.perf_counter()
+            expected = bfs_path(grid, start, goal)
+            bfs_time += time.perf_counter() - t
+            t = time.perf_counter()
+            path = weighted_path(grid, start, goal, lambda i: 1)
+            weighted_time += time.perf_counter() - t
+            if len(path) != len(expected) or (path and not follows(grid, start, goal, path)):
+                sys.exit(f"weighted_path {start} -> {goal}: {len(path)} moves, bfs_path: {len(expected)}")
+            queries += 1
+            found += bool(expected)
+    print(f"{queries} queries ({found} reachable), weighted_path matches bfs_path")
+    print(f"bfs_path      {bfs_time / queries * 1e6:>8.1f} us/query")
+    print(f"weighted_path {weighted_time / queries * 1e6:>8.1f} us/query")
+
+
+if __name__ == "__main__":
+    main()
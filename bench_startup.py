@@ -0,0 +1,62 @@
+"""
+Startup-time benchmark.
+
+Measures, in fresh interpreters, how long it takes to import the simulation
+core and to build a headless simulation, and checks that none of it pulls
+in pygame. The render module is measured for comparison.
+
+Usage: python bench_startup.py [repeats]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+PROBE = """
+import sys, time, resource
+t = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - t
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(elapsed, rss, int('pygame' in sys.modules))
+"""
+
+CASES = [
+    ("import fuzzy_logic", "import fuzzywarehouse.core.fuzzy_logic"),
+    ("import robot", "from fuzzywarehouse.core.robot import Robot"),
+    ("import simulation", "import fuzzywarehouse.core.simulation"),
+    ("create simulation", "from fuzzywarehouse.core.simulation import Simulation; "
+                          "Simulation.create(640, 480, 40, seed=1)"),
+    ("import render", "import fuzzywarehouse.render.draw"),
+]
+
+
+def measure(code, repeats):
+    """Runs the code in `repeats` fresh interpreters; returns (median seconds, max RSS KiB, loads pygame)"""
+    times, rss, pygame_loaded = [], 0, False
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    for _ in range(repeats):
+        out = subprocess.run([sys.executable, "-c", PROBE.format(code=code)], cwd=HERE, env=env,
+                             capture_output=True, text=True, check=True).stdout.split()
+        times.append(float(out[0]))
+        rss = max(rss, int(out[1]))
+        pygame_loaded = pygame_loaded or out[2] == "1"
+    return statistics.median(times), rss, pygame_loaded
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    print(f"{'case':<20} {'median ms':>10} {'max RSS KiB':>12}  pygame")
+    for name, code in CASES:
+        try:
+            seconds, rss, pygame_loaded = measure(code, repeats)
+        except subprocess.CalledProcessError as e:
+            print(f"{name:<20} failed: {e.stderr.strip().splitlines()[-1]}")
+            continue
+        print(f"{name:<20} {seconds * 1000:>10.2f} {rss:>12}  {'yes' if pygame_loaded else 'no'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Traffic planning benchmark.
+
+Runs a dense floor with plain BFS planning and with congestion-weighted
+planning (Simulation.enable_traffic) and compares deliveries. The floor is
+split by a wall with a one-lane aisle in the middle and two longer bypass
+aisles; generators are kept stocked every tick so travel and congestion,
+not item supply, limit throughput.
+
+Usage: python bench_traffic.py [robots] [ticks] [seeds] [decay weight ...]
+"""
+import random
+import sys
+import time
+
+from fuzzywarehouse.core.layout import parse_ascii
+from fuzzywarehouse.core.simulation import Simulation
+
+COLS, ROWS = 30, 20
+AISLES = (10, 4, 16)  # Rows of the openings in the wall (the middle one is the shortest way)
+
+
+def floor_text(n_robots, rng):
+    """ASCII layout of the benchmark floor with robots on random empty cells"""
+    rows = [["_"] * COLS for _ in range(ROWS)]
+    for y in range(1, ROWS - 1):
+        if y not in AISLES:
+            rows[y][COLS // 2] = "."
+    for y in range(1, ROWS - 1, 2):
+        rows[y][0] = "-"
+    for y in range(2, ROWS, 4):
+        rows[y][COLS - 1] = "#"
+    free = [(x, y) for y in range(ROWS) for x in range(2, COLS - 2) if rows[y][x] == "_"]
+    for x, y in rng.sample(free, n_robots):
+        rows[y][x] = "*"
+    return "\n".join("".join(row) for row in rows)
+
+
+def run(n_robots, ticks, seed, traffic=None):
+    """Deliveries of one run; traffic is None for BFS or the keyword arguments of enable_traffic()"""
+    rng = random.Random(seed)
+    sim = Simulation.from_layout(parse_ascii(floor_text(n_robots, rng)), seed=seed)
+    sim.enable_deadlock_resolution()
+    if traffic is not None:
+        sim.enable_traffic(**traffic)
+    for _ in range(ticks):
+        for gen in sim.generators:
+            if gen.item_id is None:
+                sim.inject_item(gen, rng.random(), rng.random(), rng.random())
+        sim.step()
+    return sum(z.items_received for z in sim.dropzones)
+
+
+def main():
+    n_robots = int(sys.argv[1]) if len(sys.argv) > 1 else 24
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    seeds = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    params = [float(v) for v in sys.argv[4:]]
+    cases = [("bfs", None)]
+    if params:
+        cases += [(f"decay={d} weight={w}", {"decay": d, "weight": w}) for d, w in zip(params[::2], params[1::2])]
+    else:
+        cases.append(("traffic (defaults)", {}))
+    print(f"{n_robots} robots, {ticks} ticks, {seeds} seeds")
+    for name, traffic in cases:
+        t = time.perf_counter()
+        delivered = sum(run(n_robots, ticks, seed, traffic) for seed in range(seeds))
+        print(f"{name:<28} {delivered:>7} delivered  {time.perf_counter() - t:>6.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+"""
+Fuzzy Warehouse: robots deliver items to zones chosen by fuzzy logic.
+
+- core: the simulation engine and its data structures, without pygame
+- render: pygame drawing and frame capture
+- env, server: training environments and the local control server
+- app: the command-line entry point (python -m fuzzywarehouse)
+
+The package imports nothing itself, so importing a core module never loads
+the rest of the engine or pygame.
+"""
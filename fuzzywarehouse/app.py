@@ -0,0 +1,119 @@
+import argparse
+import sys
+
+from .core.simulation import Simulation, GRID_WIDTH, GRID_HEIGHT, CELL_SIZE
+from .core.journal import EventJournal, TextSink
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fuzzy warehouse simulation")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--view-every", type=int, metavar="N",
+                        help="run the engine at full speed and show every Nth tick")
+    parser.add_argument("--headless", type=int, metavar="TICKS",
+                        help="run TICKS ticks without a window")
+    parser.add_argument("--capture", metavar="PATH",
+                        help="with --headless, save frames to a .zip of PNGs (or a video through ffmpeg)")
+    parser.add_argument("--capture-every", type=int, default=10, metavar="N")
+    parser.add_argument("--planning-workers", type=int, metavar="N",
+                        help="plan the path searches of each phase on N worker processes (for large fleets)")
+    parser.add_argument("--kpis", metavar="PATH",
+                        help="with --headless, export latency and throughput KPIs (.csv, otherwise JSON)")
+    return parser.parse_args(argv)
+
+
+def run_headless(args):
+    """Runs the engine without a window, optionally capturing every Nth frame"""
+    sim = Simulation.create(GRID_WIDTH, GRID_HEIGHT, CELL_SIZE, seed=args.seed)
+    recorder = None
+    if args.capture:
+        # Capturing draws frames with pygame, so only then is it imported
+        from .render.capture import FrameArchive, VideoWriter
+        kind = FrameArchive if args.capture.endswith(".zip") else VideoWriter
+        recorder = sim.add_observer(kind(args.capture, every=args.capture_every))
+    kpis = sim.enable_kpis() if args.kpis else None
+    sim.run(args.headless)
+    if recorder is not None:
+        recorder.close()
+    if kpis is not None:
+        (kpis.save_csv if args.kpis.endswith(".csv") else kpis.save_json)(args.kpis)
+    print(f"{args.headless} ticks, {sum(z.items_received for z in sim.dropzones)} items delivered")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.headless is not None:
+        run_headless(args)
+        return
+
+    # pygame and the drawing code are only needed for the window, so they are
+    # imported here rather than at module level
+    import pygame
+    from .render import draw
+
+    pygame.init()
+    screen = pygame.display.set_mode((draw.SCREEN_WIDTH, draw.SCREEN_HEIGHT))
+    pygame.display.set_caption("Fuzzy Warehouse Simulation")
+    clock = pygame.time.Clock()
+
+    # Build the warehouse: generators, drop zones, robots and obstacles
+    # Item events are printed to the console by the journal's writer thread
+    journal = EventJournal(TextSink(sys.stdout), batch_size=1)
+    sim = Simulation.create(GRID_WIDTH, GRID_HEIGHT, CELL_SIZE, seed=args.seed, journal=journal)
+    robots = sim.robots
+    # Path searches requested in the same frame run together on a process pool, when asked for
+    planning = sim.enable_planning_service(args.planning_workers) if args.planning_workers else None
+
+    if args.view_every:
+        # The engine runs flat out; the window is an observer drawing every Nth tick
+        from .render.capture import WindowViewer
+        viewer = sim.add_observer(WindowViewer(screen, every=args.view_every))
+        while not viewer.closed:
+            sim.step()
+        journal.close()
+        if planning is not None:
+            planning.close()
+        pygame.quit()
+        return
+
+    move_delay = 500  # Milliseconds between robot moves
+    item_delay = 2000  # Milliseconds between item generation attempts
+    last_move = pygame.time.get_ticks()
+    last_gen = pygame.time.get_ticks()
+
+    while True:
+        now = pygame.time.get_ticks()
+        for e in pygame.event.get():
+            if e.type == pygame.QUIT:
+                journal.close()
+                if planning is not None:
+                    planning.close()
+                pygame.quit();
+                sys.exit()
+
+        # Generate new items
+        if now - last_gen > item_delay:
+            sim.spawn_items()
+            last_gen = now
+
+        # Assign pickup tasks to free robots
+        sim.assign_pending()
+
+        # Move robots at regular intervals if not currently animating
+        if now - last_move > move_delay:
+            if not any(r.animating for r in robots):
+                sim.move_robots()
+                last_move = now
+
+        # Check for pickup and delivery completions
+        sim.complete_tasks()
+
+        # Draw everything
+        for r in robots: r.update()
+        draw.draw_frame(screen, sim)
+
+        pygame.display.flip()
+        clock.tick(60)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,5 @@
+"""
+Simulation engine: grid, robots, stations, planners, layouts, snapshots and
+the bookkeeping around them. Nothing here imports pygame, so worker
+processes and headless runs never start SDL.
+"""
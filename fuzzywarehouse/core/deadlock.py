@@ -0,0 +1,163 @@
+"""
+Deadlock detection and resolution through a wait-for graph.
+
+Robots with wait_ticks > 0 stand still when their next move is blocked
+instead of starting random avoidance at once, and record the cell they are
+waiting for. After every move round the resolver links each waiting robot
+to the robot standing on that cell. Every robot waits for at most one
+other, so the graph is a set of chains, and a chain that loops back is a
+deadlock (two robots meeting head-on is a cycle of length 2).
+
+Each deadlock is resolved deterministically: the lowest-priority robot of
+the cycle yields. It walks to the nearest empty cell that is off the routes
+of the other robots in the cycle, holds there for a few ticks while they
+pass, then replans to its goal.
+
+Priority: delivering > picking up > free, then the priority of the carried
+item; ties go to the lower robot id.
+"""
+from collections import deque
+from itertools import islice
+
+from .grid import EMPTY
+from .journal import DEADLOCK
+from .pathfinding import MOVES
+from .robot import FREE, PICKUP, DELIVERING
+
+STATE_RANK = {FREE: 0, PICKUP: 1, DELIVERING: 2}
+
+
+def robot_priority(robot, items):
+    """Sort key of a robot's right of way (higher keeps it); items is the ItemLedger"""
+    i = robot.item_id
+    return STATE_RANK[robot.state], items.priority[i] if i is not None else 0.0, -robot.id
+
+
+class DeadlockResolver:
+    def __init__(self, index, grid, items, wait_ticks=3, escape_radius=8, horizon=12, hold_ticks=2):
+        """
+        Initializes the resolver.
+
+        Parameters:
+        - index: SpatialIndex of the robots (finds the robot on a cell)
+        - grid: the Grid the robots move on
+        - items: ItemLedger with the priorities of the robots' items
+        - wait_ticks: ticks a blocked robot waits before falling back to random avoidance
+        - escape_radius: maximum number of moves to an escape cell
+        - horizon: number of cells of the other robots' routes the escape cell must avoid
+        - hold_ticks: ticks the yielding robot stays on the escape cell
+        """
+        self.index = index
+        self.grid = grid
+        self.items = items
+        self.wait_ticks = wait_ticks
+        self.escape_radius = escape_radius
+        self.horizon = horizon
+        self.hold_ticks = hold_ticks
+
+        # Counters
+        self.deadlocks = 0  # Cycles detected
+        self.head_on = 0  # Of which two robots blocking each other
+        self.resolved = 0  # Cycles broken by a yielding robot
+        self.unresolved = 0  # Cycles where no robot had an escape cell
+        self.blocked_ticks = 0  # Robot-ticks spent waiting for a blocked cell
+        self.yield_ticks = 0  # Robot-ticks spent on escape detours
+
+    def update(self, robots, journal):
+        """Builds the wait-for graph of the last move round and breaks its cycles"""
+        waits = {}
+        for r in robots:
+            if r.escape is not None:
+                self.yield_ticks += 1
+                if not r.path:
+                    self._resume(r)
+            if r.blocked_cell is not None:
+                self.blocked_ticks += 1
+                other = self.index.at(*r.blocked_cell)
+                if other is not None and other.path:
+                    waits[r] = other
+
+        # Follow each chain once; a robot met again on the same walk closes a cycle
+        done = set()
+        for start in sorted(waits, key=lambda r: r.id):
+            walk = []
+            on_walk = set()
+            r = start
+            while r in waits and r not in done and r not in on_walk:
+                walk.append(r)
+                on_walk.add(r)
+                r = waits[r]
+            if r in on_walk:
+                self._resolve(walk[walk.index(r):], journal)
+            done.update(walk)
+
+    def _resolve(self, cycle, journal):
+        self.deadlocks += 1
+        if len(cycle) == 2:
+            self.head_on += 1
+        for r in sorted(cycle, key=lambda r: robot_priority(r, self.items)):
+            if r.goal is None:
+                continue
+            reserved = set()
+            for other in cycle:
+                if other is not r:
+                    reserved.add((other.grid_x, other.grid_y))
+                    reserved.update(islice(other.route_cells(), self.horizon))
+            path = self._escape_path(r, reserved)
+            if path is not None:
+                r.yield_along(path, self.hold_ticks)
+                self.resolved += 1
+                if journal.info:
+                    x, y = r.grid_x, r.grid_y
+                    for d in path:
+                        x, y = x + MOVES[d][0], y + MOVES[d][1]
+                    journal.emit(DEADLOCK, r.id, len(cycle), x, y, len(path))
+                return
+        self.unresolved += 1
+
+    def _escape_path(self, robot, reserved):
+        """Shortest path through empty cells to the nearest cell outside reserved, or None"""
+        C, R = self.grid.cols, self.grid.rows
+        cells = self.grid.cells
+        start = (robot.grid_x, robot.grid_y)
+        prev = {start: None}
+        queue = deque([(start, 0)])
+        while queue:
+            (x, y), dist = queue.popleft()
+            if (x, y) != start and (x, y) not in reserved:
+                path = []
+                cur = (x, y)
+                while prev[cur] is not None:
+                    cur, d = prev[cur]
+                    path.append(d)
+                path.reverse()
+                return path
+            if dist == self.escape_radius:
+                continue
+            for d, (dx, dy) in MOVES.items():
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < C and 0 <= ny < R and (nx, ny) not in prev and cells[ny * C + nx] == EMPTY:
+                    prev[(nx, ny)] = ((x, y), d)
+                    queue.append(((nx, ny), dist + 1))
+        return None
+
+    def _resume(self, robot):
+        """Holds a yielding robot on its escape cell, then sends it back to its goal"""
+        goal, hold = robot.escape
+        if hold > 0:
+            robot.escape = (goal, hold - 1)
+            return
+        robot.escape = None
+        robot.move_to(*goal)
+
+    def stats(self, tick_seconds):
+        """Returns the counters, with the time lost converted to seconds"""
+        return {
+            "deadlocks": self.deadlocks,
+            "head_on": self.head_on,
+            "resolved": self.resolved,
+            "unresolved": self.unresolved,
+            "blocked_ticks": self.blocked_ticks,
+            "yield_ticks": self.yield_ticks,
+            "time_lost_s": (self.blocked_ticks + self.yield_ticks) * tick_seconds,
+        }
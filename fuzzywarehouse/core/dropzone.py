@@ -0,0 +1,35 @@
+from .grid import DROPZONE
+
+
+class DropZone:
+    def __init__(self, grid_x, grid_y, grid, name=""):
+        """
+        Initializes a drop zone at a specific position on the grid.
+
+        Parameters:
+        - grid_x: horizontal position on the grid
+        - grid_y: vertical position on the grid
+        - grid: reference to the grid object (assumed to have cells and cell_size attributes)
+        - name: optional name for the drop zone
+        """
+        self.grid_x = grid_x
+        self.grid_y = grid_y
+        self.grid = grid
+
+        # Mark the drop zone's position in the grid
+        self.grid.set(self.grid_x, self.grid_y, DROPZONE)
+
+        # Calculate pixel coordinates for drawing
+        self.x = grid_x * grid.cell_size
+        self.y = grid_y * grid.cell_size
+
+        # Store the optional name of the drop zone
+        self.name = name
+        
+        # Counter for items received
+        self.items_received = 0
+
+    def add_item(self):
+        """Increment the counter for received items"""
+        self.items_received += 1
+
@@ -41,8 +41,10 @@ def high(x):
     return max(0.0, min(1.0, (x - 0.5) / 0.3)) if x >= 0.5 else 0.0
 
 def classify_item(item_attr):
-    sz, fr, pr = item_attr.size, item_attr.fragility, item_attr.priority
+    return classify(item_attr.size, item_attr.fragility, item_attr.priority)
 
+def classify(sz, fr, pr):
+    """Returns the zone name for an item's size, fragility and priority"""
     # Calculate membership degrees for each attribute in each fuzzy set
     s_low, s_med, s_high = low(sz), medium(sz), high(sz)
     f_low, f_med, f_high = low(fr), medium(fr), high(fr)
@@ -0,0 +1,83 @@
+from multiprocessing import shared_memory
+
+# Cell codes of the grid layer
+EMPTY = 0
+OBSTACLE = 1
+GENERATOR = 2
+DROPZONE = 3
+ROBOT = 4
+
+
+class Grid:
+    def __init__(self, w, h, cs, cells=None):
+        """
+        Initializes the grid.
+
+        Parameters:
+        - w, h: size of the floor in pixels
+        - cs: cell size in pixels
+        - cells: optional writable byte buffer of cols * rows cell codes, row by row
+          (bytearray, memory map or shared memory); a new empty layer by default
+        """
+        self.width, self.height, self.cell_size = w, h, cs
+        self.cols = w // cs;
+        self.rows = h // cs
+        self.cells = cells if cells is not None else bytearray(self.cols * self.rows)
+        self.static_changes = []  # (x, y) of obstacles added or removed at runtime, in order
+        self.shm = None  # SharedMemory block holding the layer, see share()
+        self._shares = 0  # share() calls not yet matched by unshare()
+
+    def get(self, x, y):
+        """Returns the code of cell (x, y)"""
+        return self.cells[y * self.cols + x]
+
+    def set(self, x, y, code):
+        """Stores a code in cell (x, y)"""
+        self.cells[y * self.cols + x] = code
+
+    def is_free(self, x, y):
+        """True if (x, y) is inside the grid and empty"""
+        return 0 <= x < self.cols and 0 <= y < self.rows and self.cells[y * self.cols + x] == EMPTY
+
+    # ---------- Shared memory ----------
+    def share(self):
+        """
+        Moves the cell layer into shared memory so worker processes can attach
+        to it by name (see attach()). Returns the SharedMemory block; call
+        unshare() with it when done. A layer that is already shared (e.g. by
+        a sharded run and a planning pool) stays in the same block, and goes
+        back to private memory with the last unshare().
+        """
+        self._shares += 1
+        if self.shm is not None:
+            return self.shm
+        n = self.cols * self.rows
+        shm = shared_memory.SharedMemory(create=True, size=n)
+        shm.buf[:n] = self.cells
+        self.cells = shm.buf[:n]
+        self.shm = shm
+        return shm
+
+    def unshare(self, shm):
+        """Matches a share(); the last one copies the layer back into private memory and releases the block"""
+        if shm is not self.shm:
+            raise ValueError("This block does not hold the grid's layer")
+        self._shares -= 1
+        if self._shares:
+            return
+        cells = self.cells
+        self.cells = bytearray(cells)
+        cells.release()
+        shm.close()
+        shm.unlink()
+        self.shm = None
+
+    @classmethod
+    def attach(cls, name, w, h, cs):
+        """
+        Opens a grid whose layer another process shared; returns (grid, shm).
+        Close shm after releasing grid.cells.
+        """
+        shm = shared_memory.SharedMemory(name=name)
+        grid = cls(w, h, cs, shm.buf[:(w // cs) * (h // cs)])
+        return grid, shm
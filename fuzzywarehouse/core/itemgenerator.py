@@ -0,0 +1,77 @@
+import random
+from .grid import GENERATOR
+
+class ItemGenerator:
+    def __init__(self, grid_x, grid_y, grid, rng=None):
+        """
+        Initializes the item generator on a grid.
+
+        Parameters:
+        - grid_x: horizontal position on the grid
+        - grid_y: vertical position on the grid
+        - grid: reference to the grid object (assumed to have cells and cell_size)
+        - rng: random source for spawning (defaults to the random module)
+        """
+        self.grid_x = grid_x
+        self.grid_y = grid_y
+        self.grid = grid
+        self.rng = rng or random
+
+        # Mark the generator's position in the grid
+        self.grid.set(self.grid_x, self.grid_y, GENERATOR)
+
+        self.capacity = 1  # Capacity: how many items it can hold at once
+        self.item_id = None  # Ledger id of the item it holds; initially, no item is generated
+        self.id = -1  # Index in the simulation, recorded with its items
+        self.items = None  # ItemLedger the items are recorded in, set by the simulation
+
+        # Pixel coordinates for drawing
+        self.x = grid_x * grid.cell_size
+        self.y = grid_y * grid.cell_size
+
+    def generate_item(self, tick=0):
+        """
+        Attempts to generate a new item with a 10% probability.
+        Only generates if there is no current item.
+
+        Parameters:
+        - tick: spawn stamp of the new item
+
+        Returns:
+        - The ledger id of the new item if successful
+        - None if generation didn't occur
+        """
+        if self.item_id is None and self.rng.random() < 0.1:
+            # Randomly generate item attributes between 0 and 1
+            size = round(self.rng.random(), 2)  # Size of the item (0 to 1)
+            fragility = round(self.rng.random(), 2)  # Fragility of the item (0 to 1)
+            priority = round(self.rng.random(), 2)  # Priority of the item (0 to 1)
+            self.item_id = self.items.add(size, fragility, priority, self.id, tick)
+            return self.item_id
+        return None
+
+    def place_item(self, size, fragility, priority, tick=0):
+        """
+        Places an item with the given attributes (instead of a random one).
+
+        Returns:
+        - The ledger id of the new item if the generator was empty
+        - None if it already holds an item
+        """
+        if self.item_id is not None:
+            return None
+        self.item_id = self.items.add(size, fragility, priority, self.id, tick)
+        return self.item_id
+
+    def remove_item(self):
+        """
+        Removes the currently held item (if any).
+
+        Returns:
+        - True if an item was removed
+        - False if there was no item
+        """
+        if self.item_id is not None:
+            self.item_id = None
+            return True
+        return False
@@ -0,0 +1,204 @@
+"""
+Structured event journal.
+
+Events are stored as fixed tuples in a preallocated ring buffer and written
+to a sink in batches by a background thread, so recording an event never
+touches stdout or the filesystem on the simulation thread.
+
+Record fields: (tick, kind, actor, target, x, y, a, b, c)
+- spawn:   actor=generator, (x, y)=generator cell, (a, b, c)=size, fragility, priority
+- assign:  actor=robot, target=generator, (x, y)=robot cell
+- pickup:  actor=robot, target=drop zone chosen by fuzzy logic, (x, y)=robot cell
+- deliver: actor=robot, target=drop zone, (x, y)=robot cell
+- avoid:   actor=robot, (x, y)=robot cell, a=blocked direction index (udlr)
+- replan:  actor=robot, (x, y)=destination, a=path length
+- deadlock: actor=yielding robot, target=robots in the cycle, (x, y)=escape cell, a=escape path length
+"""
+import json
+import struct
+import threading
+
+# Verbosity levels
+OFF = 0
+INFO = 1  # Item lifecycle: spawn, assign, pickup, deliver
+DEBUG = 2  # Also per-move events: collision avoidance and replans
+
+# Event kinds
+SPAWN, ASSIGN, PICKUP, DELIVER, AVOID, REPLAN, DEADLOCK = range(7)
+EVENT_NAMES = ("spawn", "assign", "pickup", "deliver", "avoid", "replan", "deadlock")
+
+RECORD = struct.Struct("<qBiihhddd")
+BINARY_MAGIC = b"FWEJ\x01\x00\x00\x00"
+
+
+class EventJournal:
+    def __init__(self, sink=None, level=INFO, capacity=65536, batch_size=1024, flush_interval=0.5):
+        """
+        Initializes the journal.
+
+        Parameters:
+        - sink: object with write(records) and close(); None keeps events in memory (see drain())
+        - level: OFF, INFO or DEBUG
+        - capacity: size of the ring buffer; the oldest events are dropped when it overflows
+        - batch_size: number of buffered events that wakes the writer
+        - flush_interval: seconds after which the writer flushes a partial batch
+        """
+        self.sink = sink
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.tick = 0  # Timestamp for new events, kept up to date by the simulation
+        self.dropped = 0  # Events overwritten before they were written
+
+        self._ring = [None] * capacity
+        self._head = 0  # Total events written into the ring
+        self._tail = 0  # Total events consumed from the ring
+        self._lock = threading.Lock()
+        self._sink_lock = threading.Lock()  # Held while a batch is drained and written, keeping batches in order
+        self._wake = threading.Event()
+        self._closed = False
+        self._writer = None
+        self.set_level(level)
+
+    def set_level(self, level):
+        """
+        Changes the verbosity (OFF, INFO or DEBUG) at runtime, starting the
+        writer if a sink now receives events. NULL_JOURNAL is shared by every
+        simulation without a journal, so it stays OFF; give a simulation its
+        own journal with set_journal() instead.
+        """
+        if level > OFF and self is NULL_JOURNAL:
+            raise ValueError("NULL_JOURNAL is shared and stays OFF; use a journal of your own")
+        self.level = level
+        # Call sites test these flags before building an event, so a disabled
+        # journal costs a single attribute lookup
+        self.info = level >= INFO
+        self.debug = level >= DEBUG
+        if self.sink is not None and level > OFF and self._writer is None and not self._closed:
+            self._writer = threading.Thread(target=self._run, name="event-journal", daemon=True)
+            self._writer.start()
+
+    def emit(self, kind, actor=-1, target=-1, x=-1, y=-1, a=0.0, b=0.0, c=0.0):
+        """Records an event at the current tick"""
+        with self._lock:
+            if self._head - self._tail >= self.capacity:
+                self._tail += 1
+                self.dropped += 1
+            self._ring[self._head % self.capacity] = (self.tick, kind, actor, target, x, y, a, b, c)
+            self._head += 1
+            if self._head - self._tail >= self.batch_size:
+                self._wake.set()
+
+    def drain(self):
+        """Removes and returns all buffered events, oldest first"""
+        with self._lock:
+            start, end = self._tail, self._head
+            cap = self.capacity
+            lo, hi = start % cap, end % cap
+            if end - start == 0:
+                return []
+            if lo < hi:
+                batch = self._ring[lo:hi]
+            else:
+                batch = self._ring[lo:] + self._ring[:hi]
+            self._tail = end
+        return batch
+
+    def flush(self):
+        """Writes every buffered event to the sink"""
+        with self._sink_lock:
+            batch = self.drain()
+            if batch and self.sink is not None:
+                self.sink.write(batch)
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def close(self):
+        """Stops the writer, flushes the remaining events and closes the sink"""
+        self._closed = True
+        if self._writer is not None:
+            self._wake.set()
+            self._writer.join()
+        if self.sink is not None:
+            self.flush()
+            with self._sink_lock:
+                self.sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JsonlSink:
+    """Writes one JSON object per event"""
+
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8")
+
+    def write(self, records):
+        lines = []
+        for t, kind, actor, target, x, y, a, b, c in records:
+            lines.append(json.dumps({"t": t, "ev": EVENT_NAMES[kind], "actor": actor, "target": target,
+                                     "x": x, "y": y, "a": a, "b": b, "c": c}, separators=(",", ":")))
+        self.file.write("\n".join(lines) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class BinarySink:
+    """Writes fixed-size little-endian records (see RECORD) after an 8-byte header"""
+
+    def __init__(self, path):
+        self.file = open(path, "wb")
+        self.file.write(BINARY_MAGIC)
+
+    def write(self, records):
+        self.file.write(b"".join(RECORD.pack(*r) for r in records))
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class TextSink:
+    """Writes human-readable lines to a text stream (e.g. sys.stdout)"""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, records):
+        lines = []
+        for t, kind, actor, target, x, y, a, b, c in records:
+            if kind == SPAWN:
+                lines.append(f"[{t}] Generated new item at ({x},{y}) "
+                             f"[size={a}, fragility={b}, priority={c}]")
+            elif kind == REPLAN:
+                lines.append(f"[{t}] Robot {actor + 1} planned {int(a)} moves to ({x},{y})")
+            else:
+                lines.append(f"[{t}] {EVENT_NAMES[kind]} robot={actor + 1} target={target} at ({x},{y})")
+        self.stream.write("\n".join(lines) + "\n")
+        self.stream.flush()
+
+    def close(self):
+        pass
+
+
+def read_binary(path):
+    """Reads back the records written by BinarySink"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+        raise ValueError("Not an event journal")
+    return list(RECORD.iter_unpack(data[len(BINARY_MAGIC):]))
+
+
+# Shared disabled journal used when none is configured
+NULL_JOURNAL = EventJournal(level=OFF, capacity=1)
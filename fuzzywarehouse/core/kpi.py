@@ -0,0 +1,205 @@
+"""
+Item lifecycle latency and throughput KPIs.
+
+Every item is stamped with the tick it was spawned, assigned, picked up and
+delivered (see ledger.py). On delivery the KpiTracker records the item's phase
+durations into latency sketches, grouped overall, per drop zone, per
+generator and per robot:
+- wait:     spawn -> assign (time the item waits at its generator)
+- pickup:   assign -> pickup (robot travel to the generator)
+- delivery: pickup -> deliver (robot travel to the drop zone)
+- lead:     spawn -> deliver
+
+After every move round it also counts, per robot, the ticks spent busy
+(picking up or delivering) and in collision avoidance or waiting on a
+blocked cell, which give utilisation and the time lost to traffic.
+
+A LatencySketch keeps counts in logarithmic buckets: any percentile is
+answered within a fixed relative error, and its memory does not depend on
+the number of recorded values, so a week-long run costs no more than a
+short one.
+"""
+import csv
+import json
+import math
+from array import array
+
+from .robot import FREE
+
+PHASES = ("wait", "pickup", "delivery", "lead")
+PERCENTILES = (0.5, 0.95, 0.99)
+
+
+class LatencySketch:
+    def __init__(self, accuracy=0.02, max_value=2 ** 24):
+        """
+        Initializes an empty sketch of non-negative integer durations (ticks).
+
+        Parameters:
+        - accuracy: relative error of the reported percentiles
+        - max_value: largest value with a bucket of its own (larger values share the last one)
+        """
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self.gamma)
+        # Bucket 0 holds zero; bucket i >= 1 holds [gamma^(i-1), gamma^i)
+        self.n_buckets = 2 + int(math.log(max_value) / self._log_gamma)
+        self.buckets = None  # array('I'), allocated by the first add()
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def add(self, value):
+        """Records one duration"""
+        if self.buckets is None:
+            self.buckets = array('I', bytes(4 * self.n_buckets))
+            self.min = self.max = value
+        i = 0 if value <= 0 else min(1 + int(math.log(value) / self._log_gamma), self.n_buckets - 1)
+        self.buckets[i] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        elif value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """Value below which a fraction q of the recorded durations lie (0 when empty)"""
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen > rank:
+                break
+        if i == 0:
+            return 0.0
+        # 2 gamma^i / (gamma + 1) is within the relative accuracy of both ends
+        # of the bucket (the arithmetic midpoint is not, at the low end)
+        value = 2 * self.gamma ** i / (self.gamma + 1)
+        return min(max(value, self.min), self.max)
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self, scale=1.0):
+        """Count, mean, p50/p95/p99 and max, multiplied by scale (e.g. seconds per tick)"""
+        out = {"count": self.count, "mean": self.mean() * scale}
+        for q in PERCENTILES:
+            out[f"p{round(q * 100)}"] = self.quantile(q) * scale
+        out["max"] = self.max * scale
+        return out
+
+
+class KpiTracker:
+    def __init__(self, zones, n_generators, n_robots, tick_seconds, accuracy=0.02):
+        """
+        Initializes the tracker.
+
+        Parameters:
+        - zones: names of the drop zones, in simulation order
+        - n_generators: number of item generators
+        - n_robots: number of robots
+        - tick_seconds: simulated seconds per tick
+        - accuracy: relative error of the latency percentiles
+        """
+        self.zones = list(zones)
+        self.tick_seconds = tick_seconds
+        self.accuracy = accuracy
+        self.ticks = 0  # Move rounds observed
+        self.overall = self._phase_sketches()
+        self.by_zone = [self._phase_sketches() for _ in self.zones]
+        self.by_generator = [self._phase_sketches() for _ in range(n_generators)]
+        self.by_robot = [self._phase_sketches() for _ in range(n_robots)]
+
+        # Robot-tick counters, one slot per robot
+        self.busy_ticks = array('Q', bytes(8 * n_robots))  # Picking up or delivering
+        self.avoid_ticks = array('Q', bytes(8 * n_robots))  # Avoiding collisions or waiting on a blocked cell
+
+    def _phase_sketches(self):
+        return {phase: LatencySketch(self.accuracy) for phase in PHASES}
+
+    def delivered(self, items, i):
+        """
+        Records the lifecycle of a delivered item.
+
+        Parameters:
+        - items: the ItemLedger
+        - i: id of the item, with all four stamps set
+        """
+        spawn, assign, pickup, deliver = (items.spawn_tick[i], items.assign_tick[i],
+                                          items.pickup_tick[i], items.deliver_tick[i])
+        durations = (assign - spawn, pickup - assign, deliver - pickup, deliver - spawn)
+        for group in (self.overall, self.by_zone[items.zone[i]], self.by_generator[items.generator[i]],
+                      self.by_robot[items.robot[i]]):
+            for phase, value in zip(PHASES, durations):
+                group[phase].add(value)
+
+    def record_tick(self, robots):
+        """Counts the busy and avoiding robots of the last move round"""
+        self.ticks += 1
+        busy, avoid = self.busy_ticks, self.avoid_ticks
+        for r in robots:
+            if r.state != FREE:
+                busy[r.id] += 1
+            if r.in_collision_avoidance or r.blocked_cell is not None:
+                avoid[r.id] += 1
+
+    # ---------- Export ----------
+    def hours(self):
+        """Simulated hours observed"""
+        return self.ticks * self.tick_seconds / 3600
+
+    def _group(self, sketches, busy=None, avoid=None):
+        hours = self.hours()
+        delivered = sketches["lead"].count
+        out = {
+            "deliveries": delivered,
+            "deliveries_per_hour": delivered / hours if hours else 0.0,
+        }
+        if busy is not None:
+            out["utilisation"] = busy / self.ticks if self.ticks else 0.0
+            out["avoidance_s"] = avoid * self.tick_seconds
+        for phase, sketch in sketches.items():
+            out[phase] = sketch.summary(self.tick_seconds)
+        return out
+
+    def report(self):
+        """
+        Returns the KPIs as a dict (durations in simulated seconds):
+        overall, per zone name, per generator index and per robot index
+        """
+        n_robots = len(self.by_robot)
+        overall = self._group(self.overall)
+        overall["utilisation"] = sum(self.busy_ticks) / (self.ticks * n_robots) if self.ticks and n_robots else 0.0
+        overall["avoidance_s"] = sum(self.avoid_ticks) * self.tick_seconds
+        return {
+            "ticks": self.ticks,
+            "hours": self.hours(),
+            "overall": overall,
+            "zones": {name: self._group(s) for name, s in zip(self.zones, self.by_zone)},
+            "generators": [self._group(s) for s in self.by_generator],
+            "robots": [self._group(s, self.busy_ticks[i], self.avoid_ticks[i]) for i, s in enumerate(self.by_robot)],
+        }
+
+    def save_json(self, path):
+        """Writes report() as JSON"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=1)
+
+    def save_csv(self, path):
+        """Writes one row per group and phase: group, key, phase, count, mean, p50, p95, p99, max"""
+        report = self.report()
+        groups = [("overall", "", report["overall"])]
+        groups += [("zone", name, g) for name, g in report["zones"].items()]
+        groups += [("generator", i, g) for i, g in enumerate(report["generators"])]
+        groups += [("robot", i, g) for i, g in enumerate(report["robots"])]
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            out = csv.writer(f)
+            out.writerow(["group", "key", "phase", "count", "mean_s", "p50_s", "p95_s", "p99_s", "max_s"])
+            for group, key, g in groups:
+                for phase in PHASES:
+                    s = g[phase]
+                    out.writerow([group, key, phase, s["count"], f"{s['mean']:.3f}", f"{s['p50']:.3f}",
+                                  f"{s['p95']:.3f}", f"{s['p99']:.3f}", f"{s['max']:.3f}"])
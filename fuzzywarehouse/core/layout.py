@@ -0,0 +1,301 @@
+"""
+Warehouse layout files.
+
+A layout is the static part of a floor: obstacles, generators and drop
+zones, plus the start cells of the robots. It has two forms:
+
+ASCII (for editing), one character per cell:
+    _  empty        .  obstacle
+    -  generator    #  drop zone (named Z1, Z2, ... in reading order)
+    *  robot start cell
+Shorter lines are padded with empty cells.
+
+A layout a simulation can run needs exactly one drop zone for each zone the
+fuzzy rules deliver to, Z1 to Z5, so an ASCII layout has exactly five '#'.
+Every generator must reach every drop zone and robots must start connected
+to the stations; Simulation.from_layout() checks both on the tables.
+
+Binary (for large floors), written by save_binary(base):
+    base.npy             static layer, uint8 cell codes, shape (rows, cols)
+    base.components.npy  connected component of every cell, int32 (0 = obstacle)
+    base.json            stations, robot starts and the station distance table
+The .npy files follow the NumPy format, so numpy.load can read them too.
+load_binary() memory-maps the static layer copy-on-write and hands it to
+Grid directly; the tables are precomputed, so nothing is scanned on load.
+"""
+import ast
+import json
+import mmap
+import os
+import sys
+from array import array
+from collections import deque
+
+from .grid import EMPTY, OBSTACLE, GENERATOR, DROPZONE, ROBOT
+
+ASCII_CODES = {"_": EMPTY, ".": OBSTACLE, "-": GENERATOR, "#": DROPZONE, "*": ROBOT}
+ASCII_CHARS = {code: char for char, code in ASCII_CODES.items()}
+
+ZONE_NAMES = ("Z1", "Z2", "Z3", "Z4", "Z5")  # Zones of fuzzy_logic.classify
+
+NPY_MAGIC = b"\x93NUMPY"
+INT32_DESCR = "<i4" if sys.byteorder == "little" else ">i4"
+
+
+class Layout:
+    def __init__(self, cols, rows, cells, generators, dropzones, robots, components=None,
+                 station_distances=None):
+        """
+        Initializes a layout.
+
+        Parameters:
+        - cols, rows: size of the floor in cells
+        - cells: byte buffer with the static cell codes (no robots), row by row
+        - generators: list of (x, y)
+        - dropzones: list of (x, y, name)
+        - robots: list of (x, y) robot start cells
+        - components: optional int32 buffer with the component label of each cell
+        - station_distances: optional table of shortest distances between stations
+          (generators first, then drop zones; -1 if unreachable)
+        """
+        self.cols = cols
+        self.rows = rows
+        self.cells = cells
+        self.generators = generators
+        self.dropzones = dropzones
+        self.robots = robots
+        self.components = components
+        self.station_distances = station_distances
+
+    @property
+    def stations(self):
+        """Generator and drop zone cells, in station table order"""
+        return list(self.generators) + [(x, y) for x, y, _ in self.dropzones]
+
+    def check_zones(self):
+        """Raises ValueError unless the drop zones are exactly Z1 to Z5, one each"""
+        names = [name for _, _, name in self.dropzones]
+        if sorted(names) != list(ZONE_NAMES):
+            raise ValueError(f"A layout needs exactly one drop zone for each of {', '.join(ZONE_NAMES)}; "
+                             f"found {len(names)}: {', '.join(names) or 'none'}")
+
+    def check_reachable(self):
+        """
+        Raises ValueError unless robots can serve every station, checked on
+        the precomputed tables (computed first if missing):
+        - the stations and the robot start cells lie in one connected component
+        - every generator reaches every drop zone through empty cells, since
+          any item may be sorted into any zone
+        """
+        if self.components is None or self.station_distances is None:
+            self.compute_tables()
+        regions = {self.component(x, y) for x, y in self.stations}
+        if len(regions) > 1:
+            raise ValueError(f"The stations are split over {len(regions)} disconnected regions")
+        for x, y in self.robots:
+            if self.component(x, y) not in regions:
+                raise ValueError(f"Robot start cell ({x},{y}) is cut off from the stations")
+        n = len(self.generators)
+        for i, (gx, gy) in enumerate(self.generators):
+            for j, (zx, zy, name) in enumerate(self.dropzones):
+                if self.station_distances[i][n + j] < 0:
+                    raise ValueError(f"Generator ({gx},{gy}) cannot reach drop zone {name} ({zx},{zy}) "
+                                     f"through empty cells")
+
+    def component(self, x, y):
+        """Connected component of a cell (0 for obstacles)"""
+        return self.components[y * self.cols + x]
+
+    def compute_tables(self):
+        """Precomputes the component labels and the station distance table"""
+        self.components = _label_components(self.cells, self.cols, self.rows)
+        stations = self.stations
+        self.station_distances = [_station_distances(self.cells, self.cols, self.rows, s, stations)
+                                  for s in stations]
+
+    @classmethod
+    def from_simulation(cls, sim):
+        """Captures the static layout of a running simulation"""
+        grid = sim.grid
+        cells = bytearray(grid.cells)
+        for r in sim.robots:
+            cells[r.grid_y * grid.cols + r.grid_x] = EMPTY
+        return cls(grid.cols, grid.rows, cells,
+                   [(g.grid_x, g.grid_y) for g in sim.generators],
+                   [(z.grid_x, z.grid_y, z.name) for z in sim.dropzones],
+                   [(r.grid_x, r.grid_y) for r in sim.robots])
+
+
+# ---------- ASCII form ----------
+def parse_ascii(text):
+    """Builds a Layout from its ASCII form"""
+    lines = [line.rstrip("\r\n") for line in text.splitlines()]
+    while lines and not lines[-1].strip():
+        lines.pop()
+    rows, cols = len(lines), max((len(line) for line in lines), default=0)
+    cells = bytearray(rows * cols)
+    generators, dropzones, robots = [], [], []
+    for y, line in enumerate(lines):
+        for x, char in enumerate(line):
+            code = ASCII_CODES.get(char)
+            if code is None:
+                raise ValueError(f"Unknown layout character {char!r} at ({x},{y})")
+            if code == GENERATOR:
+                generators.append((x, y))
+            elif code == DROPZONE:
+                dropzones.append((x, y, f"Z{len(dropzones) + 1}"))
+            elif code == ROBOT:
+                robots.append((x, y))
+                continue  # Robots are not part of the static layer
+            cells[y * cols + x] = code
+    return Layout(cols, rows, cells, generators, dropzones, robots)
+
+
+def to_ascii(layout):
+    """Returns the ASCII form of a layout"""
+    chars = [[ASCII_CHARS[layout.cells[y * layout.cols + x]] for x in range(layout.cols)]
+             for y in range(layout.rows)]
+    for x, y in layout.robots:
+        chars[y][x] = ASCII_CHARS[ROBOT]
+    return "\n".join("".join(row) for row in chars) + "\n"
+
+
+def load_ascii(path):
+    """Reads an ASCII layout file and precomputes its tables"""
+    with open(path, encoding="utf-8") as f:
+        layout = parse_ascii(f.read())
+    layout.compute_tables()
+    return layout
+
+
+def save_ascii(layout, path):
+    """Writes the ASCII form of a layout"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(to_ascii(layout))
+
+
+# ---------- Binary form ----------
+def _base_path(path):
+    return path[:-4] if path.endswith(".npy") else path
+
+
+def save_binary(layout, path):
+    """Writes the binary form (see module docstring), computing the tables if needed"""
+    base = _base_path(path)
+    if layout.components is None or layout.station_distances is None:
+        layout.compute_tables()
+    _write_npy(base + ".npy", "|u1", (layout.rows, layout.cols), layout.cells)
+    _write_npy(base + ".components.npy", INT32_DESCR, (layout.rows, layout.cols), layout.components)
+    meta = {
+        "version": 1,
+        "cols": layout.cols,
+        "rows": layout.rows,
+        "generators": [list(g) for g in layout.generators],
+        "dropzones": [list(z) for z in layout.dropzones],
+        "robots": [list(r) for r in layout.robots],
+        "station_distances": [list(row) for row in layout.station_distances],
+    }
+    with open(base + ".json", "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+
+def load_binary(path, use_mmap=True):
+    """
+    Loads the binary form of a layout.
+
+    With use_mmap the static layer is a copy-on-write memory map (robot moves
+    never reach the file) and the component labels a read-only one, so load
+    time does not depend on the size of the floor.
+    """
+    base = _base_path(path)
+    with open(base + ".json", encoding="utf-8") as f:
+        meta = json.load(f)
+    cols, rows = meta["cols"], meta["rows"]
+    cells = _read_npy(base + ".npy", "|u1", (rows, cols), mmap.ACCESS_COPY if use_mmap else None)
+    components = None
+    if os.path.exists(base + ".components.npy"):
+        components = _read_npy(base + ".components.npy", INT32_DESCR, (rows, cols),
+                               mmap.ACCESS_READ if use_mmap else None).cast("i")
+    return Layout(cols, rows, cells,
+                  [tuple(g) for g in meta["generators"]],
+                  [tuple(z) for z in meta["dropzones"]],
+                  [tuple(r) for r in meta["robots"]],
+                  components, meta.get("station_distances"))
+
+
+def _write_npy(path, descr, shape, data):
+    header = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': {shape}, }}"
+    # Pad so the data starts on a 64-byte boundary, as numpy does
+    total = len(NPY_MAGIC) + 4 + len(header) + 1
+    header += " " * (-total % 64) + "\n"
+    with open(path, "wb") as f:
+        f.write(NPY_MAGIC + bytes([1, 0]) + len(header).to_bytes(2, "little"))
+        f.write(header.encode("latin1"))
+        f.write(data)
+
+
+def _read_npy(path, descr, shape, access):
+    """Returns a writable memoryview over the data of a .npy file (memory-mapped unless access is None)"""
+    with open(path, "rb") as f:
+        prefix = f.read(len(NPY_MAGIC) + 2)
+        if prefix[:len(NPY_MAGIC)] != NPY_MAGIC:
+            raise ValueError(f"{path} is not a .npy file")
+        size_bytes = 2 if prefix[-2] == 1 else 4
+        header_len = int.from_bytes(f.read(size_bytes), "little")
+        header = ast.literal_eval(f.read(header_len).decode("latin1"))
+        if header["descr"] != descr or header["fortran_order"] or tuple(header["shape"]) != shape:
+            raise ValueError(f"{path} has an unexpected dtype or shape: {header}")
+        offset = len(NPY_MAGIC) + 2 + size_bytes + header_len
+        if access is None:
+            return memoryview(bytearray(f.read()))
+        mm = mmap.mmap(f.fileno(), 0, access=access)
+    return memoryview(mm)[offset:]
+
+
+# ---------- Precomputed tables ----------
+def _label_components(cells, cols, rows):
+    """Labels 4-connected regions of non-obstacle cells (1, 2, ...; obstacles get 0)"""
+    labels = array("i", bytes(4 * cols * rows))
+    label = 0
+    for start in range(cols * rows):
+        if labels[start] or cells[start] == OBSTACLE:
+            continue
+        label += 1
+        labels[start] = label
+        queue = deque([start])
+        while queue:
+            i = queue.popleft()
+            x = i % cols
+            for j, ok in ((i - cols, i >= cols), (i + cols, i + cols < cols * rows),
+                          (i - 1, x > 0), (i + 1, x < cols - 1)):
+                if ok and not labels[j] and cells[j] != OBSTACLE:
+                    labels[j] = label
+                    queue.append(j)
+    return labels
+
+
+def _station_distances(cells, cols, rows, source, stations):
+    """BFS distances from one station to every station, walking through empty cells only"""
+    targets = {y * cols + x: k for k, (x, y) in enumerate(stations)}
+    result = [-1] * len(stations)
+    start = source[1] * cols + source[0]
+    dist = {start: 0}
+    result[targets[start]] = 0
+    queue = deque([start])
+    remaining = len(stations) - 1
+    while queue and remaining:
+        i = queue.popleft()
+        x = i % cols
+        for j, ok in ((i - cols, i >= cols), (i + cols, i + cols < cols * rows),
+                      (i - 1, x > 0), (i + 1, x < cols - 1)):
+            if not ok or j in dist:
+                continue
+            if j in targets:
+                dist[j] = dist[i] + 1
+                if result[targets[j]] < 0:
+                    result[targets[j]] = dist[j]
+                    remaining -= 1
+            elif cells[j] == EMPTY:
+                dist[j] = dist[i] + 1
+                queue.append(j)
+    return result
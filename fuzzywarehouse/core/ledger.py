@@ -0,0 +1,157 @@
+"""
+Columnar item ledger.
+
+Every item ever spawned is a row of the ledger, identified by an integer id
+(its row number). Generators and robots hold the id of their item, and the
+delivering drop zone is recorded in the item's zone column, so a run creates
+no object per item. Each item costs a fixed number of bytes across the columns:
+- size, fragility, priority: attributes in [0, 1]
+- status: WAITING at its generator, ASSIGNED to a robot, CARRIED, DELIVERED
+- generator, robot, zone: indices of the entities that handled it (-1 until known)
+- spawn_tick, assign_tick, pickup_tick, deliver_tick: lifecycle stamps (-1 until then)
+
+Columns are array.array buffers that grow by whole chunks (doubling, at
+least `chunk` rows). column() returns a NumPy view of a column without
+copying, for bulk analytics and classify(); numpy is only imported there.
+A view reflects later updates of existing rows, but not rows added after
+the next growth.
+"""
+from array import array
+
+from .fuzzy_logic import classify
+
+# Item status
+WAITING, ASSIGNED, CARRIED, DELIVERED = range(4)
+STATUS_NAMES = ("waiting", "assigned", "carried", "delivered")
+
+# Column names and their array type codes
+COLUMNS = (
+    ("size", 'd'), ("fragility", 'd'), ("priority", 'd'),
+    ("status", 'B'), ("generator", 'i'), ("robot", 'i'), ("zone", 'i'),
+    ("spawn_tick", 'q'), ("assign_tick", 'q'), ("pickup_tick", 'q'), ("deliver_tick", 'q'),
+)
+# Value of the unused rows of each column
+FILL = {"size": 0.0, "fragility": 0.0, "priority": 0.0, "status": WAITING}
+
+
+class ItemLedger:
+    def __init__(self, chunk=4096):
+        """
+        Initializes an empty ledger.
+
+        Parameters:
+        - chunk: rows allocated by the first growth (later growths double the capacity)
+        """
+        self.chunk = chunk
+        self.count = 0  # Items recorded; ids run from 0 to count - 1
+        self.capacity = 0
+        for name, code in COLUMNS:
+            setattr(self, name, array(code))
+
+    def reserve(self, rows):
+        """Makes room for at least `rows` rows (reallocating every column if needed)"""
+        if rows <= self.capacity:
+            return
+        capacity = max(self.chunk, 2 * self.capacity)
+        while capacity < rows:
+            capacity *= 2
+        extra = capacity - self.capacity
+        for name, code in COLUMNS:
+            # A fresh array rather than an in-place extend, so NumPy views of
+            # the old buffer stay valid (an exported buffer cannot be resized)
+            col = array(code, getattr(self, name))
+            col.extend(array(code, [FILL.get(name, -1)]) * extra)
+            setattr(self, name, col)
+        self.capacity = capacity
+
+    def add(self, size, fragility, priority, generator, tick):
+        """Records an item spawned on a generator; returns its id"""
+        i = self.count
+        if i == self.capacity:
+            self.reserve(i + 1)
+        self.size[i] = size
+        self.fragility[i] = fragility
+        self.priority[i] = priority
+        self.generator[i] = generator
+        self.spawn_tick[i] = tick
+        self.count = i + 1
+        return i
+
+    def assign(self, i, robot, tick):
+        """Records that a robot was sent to pick up item i"""
+        self.status[i] = ASSIGNED
+        self.robot[i] = robot
+        self.assign_tick[i] = tick
+
+    def pickup(self, i, zone, tick):
+        """Records the pickup of item i and the drop zone it goes to"""
+        self.status[i] = CARRIED
+        self.zone[i] = zone
+        self.pickup_tick[i] = tick
+
+    def deliver(self, i, tick):
+        """Records the delivery of item i"""
+        self.status[i] = DELIVERED
+        self.deliver_tick[i] = tick
+
+    def attributes(self, i):
+        """(size, fragility, priority) of item i"""
+        return self.size[i], self.fragility[i], self.priority[i]
+
+    def classify_one(self, i):
+        """Fuzzy zone name of item i (see fuzzy_logic.classify)"""
+        return classify(self.size[i], self.fragility[i], self.priority[i])
+
+    # ---------- Bulk access ----------
+    def column(self, name):
+        """NumPy view of the recorded rows of a column (no copy)"""
+        import numpy as np
+        col = getattr(self, name)
+        return np.frombuffer(col, dtype=np.dtype(col.typecode))[:self.count]
+
+    def columns(self):
+        """Dict of NumPy views of every column"""
+        return {name: self.column(name) for name, _ in COLUMNS}
+
+    def classify(self, ids=None):
+        """
+        Classifies many items at once with the fuzzy rules of fuzzy_logic.
+
+        Parameters:
+        - ids: item ids (default: every item)
+
+        Returns:
+        - NumPy array of zone numbers, 0 for "Z1" to 4 for "Z5"; the same
+          zones as classify_one(), ties included
+        """
+        import numpy as np
+        sz, fr, pr = self.column("size"), self.column("fragility"), self.column("priority")
+        if ids is not None:
+            sz, fr, pr = sz[ids], fr[ids], pr[ids]
+
+        def low(x):
+            return np.where(x <= 0.5, np.clip((0.5 - x) / 0.3, 0.0, 1.0), 0.0)
+
+        def medium(x):
+            return np.where((0.2 < x) & (x < 0.5), (x - 0.2) / 0.3,
+                            np.where((0.5 <= x) & (x < 0.8), (0.8 - x) / 0.3, 0.0))
+
+        def high(x):
+            return np.where(x >= 0.5, np.clip((x - 0.5) / 0.3, 0.0, 1.0), 0.0)
+
+        rules = np.stack([
+            np.minimum(np.minimum(low(sz), high(fr)), high(pr)),  # Z1
+            np.minimum(np.minimum(high(sz), low(fr)), high(pr)),  # Z2
+            np.minimum(high(fr), medium(pr)),  # Z3
+            np.minimum(np.minimum(high(sz), low(fr)), medium(pr)),  # Z4
+            low(pr),  # Z5
+        ])
+        # argmax takes the first of equal activations, like max() over the rule dict
+        return rules.argmax(axis=0)
+
+    def status_counts(self):
+        """Number of items in each status, by status name"""
+        counts = [0] * len(STATUS_NAMES)
+        for s in self.status[:self.count]:
+            counts[s] += 1
+        return dict(zip(STATUS_NAMES, counts))
@@ -0,0 +1,215 @@
+import random
+from collections import deque
+
+from .grid import EMPTY, OBSTACLE, GENERATOR, DROPZONE, ROBOT
+
+class ObstacleGenerator:
+    def __init__(self, grid, obstacle_ratio=0.2, rng=None):
+        self.grid = grid
+        self.rng = rng or random
+        self.obstacle_ratio = obstacle_ratio
+        self.obstacle_code = OBSTACLE
+
+    def generate_obstacles(self):
+        """Generate obstacles in the grid up to the desired percentage while ensuring all paths remain valid"""
+        # Find all generators and dropzones first
+        generators = []
+        dropzones = []
+
+        for y in range(self.grid.rows):
+            for x in range(self.grid.cols):
+                if self.grid.get(x, y) == GENERATOR:
+                    generators.append((x, y))
+                elif self.grid.get(x, y) == DROPZONE:
+                    dropzones.append((x, y))
+
+        # Count free cells
+        free_cells = []
+        for y in range(self.grid.rows):
+            for x in range(self.grid.cols):
+                # Only consider empty cells that aren't adjacent to generators or dropzones
+                if self.grid.get(x, y) == EMPTY and not self._is_adjacent_to_special_cell(x, y, generators,
+                                                                                            dropzones):
+                    free_cells.append((x, y))
+
+        # Calculate how many obstacles to place
+        num_obstacles = int(len(free_cells) * self.obstacle_ratio)
+
+        # Shuffle cells to select random positions
+        self.rng.shuffle(free_cells)
+
+        # List of placed obstacles
+        placed_obstacles = []
+
+        # Place obstacles while checking that paths exist
+        for i in range(min(num_obstacles, len(free_cells))):
+            x, y = free_cells[i]
+
+            # Temporarily place the obstacle
+            self.grid.set(x, y, self.obstacle_code)
+            placed_obstacles.append((x, y))
+
+            # If there's no path from any generator to any dropzone, remove the last obstacle
+            if not self._all_paths_exist(generators, dropzones):
+                # Remove the last obstacle
+                self.grid.set(x, y, EMPTY)
+                placed_obstacles.pop()
+
+        return placed_obstacles
+
+    def add_obstacle(self, x, y, generators=None, dropzones=None):
+        """
+        Closes an empty cell at runtime, keeping the guarantees of generate_obstacles()
+
+        Parameters:
+        - x, y: the cell to close
+        - generators, dropzones: lists of their (x, y) cells, when the caller
+          knows them (otherwise the grid is scanned for them)
+
+        Returns:
+        - True if the obstacle was placed
+        - False if the cell is not empty, touches a generator or dropzone, or
+          would cut a generator, dropzone or robot off (the grid is left unchanged)
+        """
+        if not (0 <= x < self.grid.cols and 0 <= y < self.grid.rows) or self.grid.get(x, y) != EMPTY:
+            return False
+        if generators is None or dropzones is None:
+            generators, dropzones = self._find_special_cells()
+        if self._is_adjacent_to_special_cell(x, y, generators, dropzones):
+            return False
+        self.grid.set(x, y, self.obstacle_code)
+        if not self._all_paths_exist(generators, dropzones):
+            self.grid.set(x, y, EMPTY)
+            return False
+        self.grid.static_changes.append((x, y))
+        return True
+
+    def remove_obstacle(self, x, y):
+        """
+        Reopens an obstacle cell at runtime
+
+        Returns:
+        - True if the cell held an obstacle and is now empty
+        """
+        if not (0 <= x < self.grid.cols and 0 <= y < self.grid.rows) or self.grid.get(x, y) != self.obstacle_code:
+            return False
+        self.grid.set(x, y, EMPTY)
+        self.grid.static_changes.append((x, y))
+        return True
+
+    def _find_special_cells(self):
+        """Returns the positions of all generators and dropzones"""
+        generators = []
+        dropzones = []
+        for y in range(self.grid.rows):
+            for x in range(self.grid.cols):
+                if self.grid.get(x, y) == GENERATOR:
+                    generators.append((x, y))
+                elif self.grid.get(x, y) == DROPZONE:
+                    dropzones.append((x, y))
+        return generators, dropzones
+
+    def _is_adjacent_to_special_cell(self, x, y, generators, dropzones):
+        """Check if a cell is adjacent to generators or dropzones"""
+        # Define adjacent cells (no diagonals)
+        adjacent_cells = [
+            (x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)
+        ]
+
+        # Check if any adjacent cell is a generator or dropzone
+        for adj_x, adj_y in adjacent_cells:
+            # Skip if out of bounds
+            if not (0 <= adj_x < self.grid.cols and 0 <= adj_y < self.grid.rows):
+                continue
+
+            # Check if it's a generator or dropzone
+            if (adj_x, adj_y) in generators or (adj_x, adj_y) in dropzones:
+                return True
+
+        return False
+
+    def _all_paths_exist(self, generators, dropzones):
+        """
+        Check that one open region touches every generator and dropzone and
+        holds every robot, so any item can be carried to any zone
+        """
+        stations = set(generators) | set(dropzones)
+        if not stations:
+            return True
+        robots = bytes(self.grid.cells).count(ROBOT)
+        x, y = (generators or dropzones)[0]
+        seen = set()
+        # A station may touch several regions, so try each one around the first
+        for start in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if start not in seen and self._open(*start) and start not in stations:
+                touched, held = self._flood_region(start, stations, seen)
+                if touched == stations and held == robots:
+                    return True
+        return False
+
+    def _open(self, x, y):
+        """True if (x, y) is inside the grid and not an obstacle"""
+        return 0 <= x < self.grid.cols and 0 <= y < self.grid.rows and self.grid.get(x, y) != self.obstacle_code
+
+    def _flood_region(self, start, stations, seen):
+        """
+        Flood fills the region of cells robots can cross around start (robots
+        move away); stations are touched but not crossed, as in bfs_path
+
+        Returns:
+        - the set of stations the region touches
+        - the number of robots in it
+        """
+        seen.add(start)
+        touched = set()
+        held = 0
+        queue = deque([start])
+        while queue:
+            x, y = queue.popleft()
+            held += self.grid.get(x, y) == ROBOT
+            for n in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if n in stations:
+                    touched.add(n)
+                elif n not in seen and self._open(*n):
+                    seen.add(n)
+                    queue.append(n)
+        return touched, held
+
+    def ensure_all_paths(self):
+        """Remove obstacles if needed to ensure all paths exist"""
+        # Find all generators and dropzones
+        generators = []
+        dropzones = []
+
+        for y in range(self.grid.rows):
+            for x in range(self.grid.cols):
+                if self.grid.get(x, y) == GENERATOR:
+                    generators.append((x, y))
+                elif self.grid.get(x, y) == DROPZONE:
+                    dropzones.append((x, y))
+
+        # Find all obstacles
+        obstacles = []
+        for y in range(self.grid.rows):
+            for x in range(self.grid.cols):
+                if self.grid.get(x, y) == self.obstacle_code:
+                    obstacles.append((x, y))
+
+        # If all paths exist, no need to remove obstacles
+        if self._all_paths_exist(generators, dropzones):
+            return []
+
+        # Otherwise, try removing obstacles one by one until paths exist
+        self.rng.shuffle(obstacles)  # Randomize order of obstacles to remove
+        removed_obstacles = []
+
+        for obs_x, obs_y in obstacles:
+            # Remove the obstacle
+            self.grid.set(obs_x, obs_y, EMPTY)
+            removed_obstacles.append((obs_x, obs_y))
+
+            # Check if all paths exist now
+            if self._all_paths_exist(generators, dropzones):
+                break
+
+        return removed_obstacles
\ No newline at end of file
@@ -0,0 +1,265 @@
+"""
+Path planners over a Grid.
+
+Paths are lists of moves ('u', 'd', 'l', 'r') from the start cell to the goal.
+Only empty cells can be crossed; the goal itself may be occupied.
+"""
+import heapq
+import struct
+from collections import deque
+
+from .grid import EMPTY, ROBOT
+
+MOVES = {'u': (0, -1), 'd': (0, 1), 'l': (-1, 0), 'r': (1, 0)}
+INF = float("inf")
+PASSABLE = (EMPTY, ROBOT)  # Cells the incremental planner may cross
+MOVE_NAMES = 'udlr'
+MOVE_CODES = {d: i for i, d in enumerate(MOVE_NAMES)}
+PATH_COUNT = struct.Struct("<I")
+
+
+def bfs_path(grid, start, goal):
+    """Shortest path by number of moves (every cell costs 1)"""
+    R, C = grid.rows, grid.cols
+    cells = grid.cells
+    visited = [[False] * C for _ in range(R)]
+    prev = {}  # Stores previous cell and direction used to reach each cell
+
+    queue = deque([start])
+    visited[start[1]][start[0]] = True
+
+    # BFS to find path
+    while queue:
+        x, y = queue.popleft()
+        if (x, y) == goal:
+            break
+        for d, (dx, dy) in MOVES.items():
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < C and 0 <= ny < R and not visited[ny][nx]:
+                if (nx, ny) == goal or cells[ny * C + nx] == EMPTY:
+                    visited[ny][nx] = True
+                    prev[(nx, ny)] = (x, y, d)
+                    queue.append((nx, ny))
+
+    return _reconstruct(prev, start, goal)
+
+
+def weighted_path(grid, start, goal, cost, unit=1):
+    """
+    Cheapest path where entering cell index i costs cost(i), an integer of
+    at least unit.
+
+    A* with a bucket queue: costs are small integers and the heuristic (unit
+    times the Manhattan distance) is consistent, so nodes are popped in order
+    of f = g + h from an array of buckets instead of a binary heap.
+    """
+    R, C = grid.rows, grid.cols
+    cells = grid.cells
+    gx, gy = goal
+    s = start[1] * C + start[0]
+    g_goal = gy * C + gx
+    best = {s: 0}
+    prev = {}
+    # The start's f is its heuristic, so it goes in bucket h(start)
+    f = unit * (abs(gx - start[0]) + abs(gy - start[1]))
+    buckets = [[] for _ in range(f)] + [[s]]
+    while f < len(buckets):
+        bucket = buckets[f]
+        if not bucket:
+            f += 1
+            continue
+        i = bucket.pop()
+        x, y = i % C, i // C
+        g = best[i]
+        if g + unit * (abs(gx - x) + abs(gy - y)) != f:
+            continue  # Stale entry, a cheaper one was queued later
+        if i == g_goal:
+            break
+        for d, (dx, dy) in MOVES.items():
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < C and 0 <= ny < R):
+                continue
+            j = ny * C + nx
+            if j != g_goal and cells[j] != EMPTY:
+                continue
+            ng = g + cost(j)
+            if ng < best.get(j, ng + 1):
+                best[j] = ng
+                prev[(nx, ny)] = (x, y, d)
+                nf = ng + unit * (abs(gx - nx) + abs(gy - ny))
+                while len(buckets) <= nf:
+                    buckets.append([])
+                buckets[nf].append(j)
+
+    return _reconstruct(prev, start, goal)
+
+
+def _reconstruct(prev, start, goal):
+    """Rebuilds the list of moves from the predecessor map"""
+    path = []
+    cur = goal
+    if cur not in prev and cur != start:
+        return []  # No path found
+    while cur != start:
+        x0, y0, d = prev[cur]
+        path.append(d)
+        cur = (x0, y0)
+    path.reverse()  # Reverse to get path from start to destination
+    return path
+
+
+class DStarLite:
+    """
+    Incremental planner (D* Lite) over the static layer of a grid.
+
+    The search runs backwards from the goal, so when the robot moves only the
+    start changes, and when cells open or close only the affected part of the
+    previous search is repaired instead of planning from scratch. Robots are
+    ignored (they move away); obstacles, generators and drop zones block,
+    except the goal itself.
+    """
+
+    def __init__(self, grid, start, goal):
+        self.grid = grid
+        self.start = start
+        self.goal = goal
+        self.last = start
+        self.km = 0
+        C = grid.cols
+        self._goal_i = goal[1] * C + goal[0]
+        self.g = {}
+        self.rhs = {self._goal_i: 0}
+        self.queue = []
+        self.queued = {}  # node -> key currently valid in the queue
+        self._push(self._goal_i)
+        self.seen_changes = len(grid.static_changes)
+        self.compute()
+
+    # ---------- Helpers ----------
+    def _h(self, i):
+        C = self.grid.cols
+        return abs(i % C - self.start[0]) + abs(i // C - self.start[1])
+
+    def _key(self, i):
+        m = min(self.g.get(i, INF), self.rhs.get(i, INF))
+        return (m + self._h(i) + self.km, m)
+
+    def _push(self, i):
+        key = self._key(i)
+        self.queued[i] = key
+        heapq.heappush(self.queue, (key, i))
+
+    def _neighbors(self, i):
+        C, R = self.grid.cols, self.grid.rows
+        x, y = i % C, i // C
+        if y > 0:
+            yield i - C
+        if y < R - 1:
+            yield i + C
+        if x > 0:
+            yield i - 1
+        if x < C - 1:
+            yield i + 1
+
+    def _passable(self, i):
+        return i == self._goal_i or self.grid.cells[i] in PASSABLE
+
+    def _update(self, i):
+        if i != self._goal_i:
+            best = INF
+            for j in self._neighbors(i):
+                if self._passable(j):
+                    v = self.g.get(j, INF) + 1
+                    if v < best:
+                        best = v
+            self.rhs[i] = best
+        self.queued.pop(i, None)
+        if self.g.get(i, INF) != self.rhs.get(i, INF):
+            self._push(i)
+
+    def _top(self):
+        while self.queue:
+            key, i = self.queue[0]
+            if self.queued.get(i) == key:
+                return key, i
+            heapq.heappop(self.queue)  # Stale entry
+        return (INF, INF), None
+
+    # ---------- Search ----------
+    def compute(self):
+        s = self.start[1] * self.grid.cols + self.start[0]
+        while True:
+            k_old, u = self._top()
+            if u is None or (k_old >= self._key(s) and self.rhs.get(s, INF) == self.g.get(s, INF)):
+                return
+            k_new = self._key(u)
+            if k_old < k_new:
+                self._push(u)
+                continue
+            heapq.heappop(self.queue)
+            del self.queued[u]
+            if self.g.get(u, INF) > self.rhs.get(u, INF):
+                self.g[u] = self.rhs[u]
+                for p in self._neighbors(u):
+                    self._update(p)
+            else:
+                self.g[u] = INF
+                self._update(u)
+                for p in self._neighbors(u):
+                    self._update(p)
+
+    def move_start(self, start):
+        """Moves the start to the robot's current cell"""
+        if start != self.start:
+            self.start = start
+            self.km += abs(start[0] - self.last[0]) + abs(start[1] - self.last[1])
+            self.last = start
+
+    def sync(self):
+        """Applies the layout changes made since the last call and repairs the search"""
+        changes = self.grid.static_changes
+        for x, y in changes[self.seen_changes:]:
+            i = y * self.grid.cols + x
+            for p in self._neighbors(i):
+                self._update(p)
+        self.seen_changes = len(changes)
+        self.compute()
+
+    def path(self):
+        """Extracts the current best path from start to goal ([] if unreachable)"""
+        C = self.grid.cols
+        s = self.start[1] * C + self.start[0]
+        if self.g.get(s, INF) == INF and self.rhs.get(s, INF) == INF:
+            return []
+        path = []
+        limit = self.grid.cols * self.grid.rows
+        while s != self._goal_i and len(path) < limit:
+            best, best_d, best_j = INF, None, None
+            x, y = s % C, s // C
+            for d, (dx, dy) in MOVES.items():
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < C and 0 <= ny < self.grid.rows:
+                    j = ny * C + nx
+                    if self._passable(j) and self.g.get(j, INF) + 1 < best:
+                        best, best_d, best_j = self.g.get(j, INF) + 1, d, j
+            if best_j is None or best == INF:
+                return []
+            path.append(best_d)
+            s = best_j
+        return path
+
+
+# ---------- Compact encoding ----------
+def pack_path(path):
+    """Encodes a path as a 4-byte move count followed by 2 bits per move"""
+    out = bytearray(PATH_COUNT.pack(len(path)))
+    out += bytes((len(path) + 3) // 4)
+    for i, d in enumerate(path):
+        out[PATH_COUNT.size + i // 4] |= MOVE_CODES[d] << (2 * (i % 4))
+    return bytes(out)
+
+
+def unpack_path(data):
+    """Decodes a path packed by pack_path()"""
+    (n,) = PATH_COUNT.unpack_from(data, 0)
+    return [MOVE_NAMES[(data[PATH_COUNT.size + i // 4] >> (2 * (i % 4))) & 3] for i in range(n)]
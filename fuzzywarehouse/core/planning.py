@@ -0,0 +1,113 @@
+"""
+Batch path planning on a worker pool.
+
+With a PlanningService attached (Simulation.enable_planning_service),
+Robot.move_to() only records a request. The simulation flushes all requests
+of a phase together at the end of assign_pending() and complete_tasks(), and
+at the start of move_robots(). The grid does not change within a phase, so
+every path is exactly the path the robot would have planned on its own.
+
+Kinds of pool:
+- "process": worker processes attach to the grid layer in shared memory
+  (zero-copy, always the live layer) and return packed paths (2 bits per move)
+- "thread": threads search the grid in this process; useful once the search
+  itself releases the GIL, and free of inter-process traffic
+- "inline": plans in this process, in batch order (for comparison)
+
+Robots planning with D* Lite (path repair) or with the traffic heatmap keep
+planning inline, since their search state or costs live in this process.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .grid import Grid
+from .pathfinding import bfs_path, pack_path, unpack_path
+
+_grid = None  # Grid attached by a worker process
+_shm = None
+
+
+def _attach(name, width, height, cell_size):
+    global _grid, _shm
+    _grid, _shm = Grid.attach(name, width, height, cell_size)
+
+
+def _plan_batch(requests, grid=None):
+    """Plans a list of (start, goal) on the worker's grid; returns packed paths"""
+    grid = grid or _grid
+    return [pack_path(bfs_path(grid, start, goal)) for start, goal in requests]
+
+
+class PlanningService:
+    def __init__(self, grid, workers=None, kind="process", min_batch=4):
+        """
+        Initializes the service.
+
+        Parameters:
+        - grid: the Grid robots plan on (moved into shared memory for "process",
+          or reusing the block a sharded run already put it in)
+        - workers: pool size (default: the number of CPUs)
+        - kind: "process", "thread" or "inline"
+        - min_batch: batches smaller than this are planned inline, where the
+          round trip to the pool would cost more than the searches
+        """
+        if kind not in ("process", "thread", "inline"):
+            raise ValueError(f"Unknown planning pool {kind!r}")
+        self.grid = grid
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+        self.min_batch = min_batch
+        self.requests = []  # (robot, goal) in request order
+        self.shm = None
+        self.executor = None
+        if kind == "process":
+            self.shm = grid.share()
+            self.executor = ProcessPoolExecutor(self.workers, initializer=_attach,
+                                                initargs=(self.shm.name, grid.width, grid.height, grid.cell_size))
+        elif kind == "thread":
+            self.executor = ThreadPoolExecutor(self.workers)
+
+        # Counters
+        self.batches = 0
+        self.planned = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def request(self, robot, dx, dy):
+        """Queues a path request; the robot gets its path at the next flush()"""
+        self.requests.append((robot, (dx, dy)))
+
+    def flush(self):
+        """Solves every queued request and hands the paths to their robots"""
+        if not self.requests:
+            return
+        requests = self.requests
+        self.requests = []
+        jobs = [((r.grid_x, r.grid_y), goal) for r, goal in requests]
+        if self.executor is None or len(jobs) < self.min_batch:
+            paths = [bfs_path(self.grid, start, goal) for start, goal in jobs]
+        else:
+            size = -(-len(jobs) // self.workers)
+            chunks = [jobs[i:i + size] for i in range(0, len(jobs), size)]
+            if self.kind == "process":
+                results = self.executor.map(_plan_batch, chunks)
+            else:
+                results = self.executor.map(_plan_batch, chunks, [self.grid] * len(chunks))
+            paths = [unpack_path(packed) for chunk in results for packed in chunk]
+        for (r, goal), path in zip(requests, paths):
+            r.set_path(path, goal)
+        self.batches += 1
+        self.planned += len(jobs)
+
+    def close(self):
+        """Shuts the pool down (and moves the grid layer back into private memory)"""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        if self.shm is not None:
+            self.grid.unshare(self.shm)
+            self.shm = None
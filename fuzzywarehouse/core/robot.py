@@ -0,0 +1,425 @@
+import random
+
+from .journal import NULL_JOURNAL, AVOID, REPLAN
+from .grid import EMPTY, ROBOT
+from .pathfinding import MOVES, DStarLite, bfs_path, weighted_path
+from .traffic import COST_UNIT
+
+# States
+FREE = "FREE"
+PICKUP = "PICKUP"
+DELIVERING = "DELIVERING"
+
+
+class Robot:
+    def __init__(self, grid_x, grid_y, radius, grid, rng=None):
+        # Grid position
+        self.grid_x = grid_x
+        self.grid_y = grid_y
+        # Pixel position for drawing
+        self.x = (grid_x + 0.5) * grid.cell_size
+        self.y = (grid_y + 0.5) * grid.cell_size
+        self.target_x = self.x
+        self.target_y = self.y
+        self.radius = radius
+        self.grid = grid
+        self.rng = rng or random  # Random source for detours (module-level random by default)
+        self.id = -1  # Index in the simulation, used to tag journal events
+        self.journal = NULL_JOURNAL
+        self.index = None  # SpatialIndex kept up to date with position and state
+        self.heatmap = None  # TrafficHeatmap used for planning and fed with failed moves
+        self.routes = None  # RouteIndex told about every new route
+
+        # Animation
+        self.animating = False
+        self.animation_speed = 5
+
+        # Path planning and recovery
+        self.path = []
+        self.recovery_stack = []  # Stores reverse moves to get back on path after collision avoidance
+        self.in_collision_avoidance = False
+        self.goal = None  # Destination of the current path
+        self.path_repair = False  # Plan new goals with D* Lite too, so even the first repair reuses a search
+        self.planner = None  # DStarLite search kept for the current goal (after a repair, or with path_repair)
+        self.planning = None  # PlanningService that batches move_to() searches, if any
+        self.path_pending = False  # A move_to() request waits for the planning service
+
+        # Deadlock handling (see deadlock.py)
+        self.wait_ticks = 0  # Ticks to wait on a blocked move before random avoidance
+        self.blocked_ticks = 0  # Consecutive ticks the next move has been blocked
+        self.blocked_cell = None  # Cell this tick's move was blocked by, while waiting
+        self.escape = None  # (goal, hold ticks) while yielding to another robot
+
+        # State and cargo
+        self.state = FREE
+        self.item_id = None  # Ledger id of the item it was sent for or carries
+
+        # Pickup/delivery target pointers
+        self.pickup_target = None
+        self.delivery_target = None
+
+        # Eye properties
+        self.eye_radius = radius * 0.25  # Eye is 1/4 the size of the robot
+        self.eye_direction = 'r'  # Default looking right
+        self.eye_x = self.x + self.radius * 0.7
+        self.eye_y = self.y
+
+        # Mark robot position in the grid
+        self.grid.set(self.grid_x, self.grid_y, ROBOT)
+
+    def set_state(self, new_state):
+        self.state = new_state
+        if self.index is not None:
+            self.index.update(self)
+
+    def update(self):
+        if not self.animating:
+            return
+        dx = self.target_x - self.x
+        dy = self.target_y - self.y
+        if abs(dx) < self.animation_speed and abs(dy) < self.animation_speed:
+            self.x, self.y = self.target_x, self.target_y
+            self.animating = False
+        else:
+            dist = max(1, (dx * dx + dy * dy) ** 0.5)
+            self.x += dx / dist * self.animation_speed
+            self.y += dy / dist * self.animation_speed
+
+        # Update eye position during animation
+        self._update_eye_position()
+
+    def settle(self):
+        """Finish the current animation instantly (used when running without a display)"""
+        if self.animating:
+            self.x, self.y = self.target_x, self.target_y
+            self.animating = False
+            self._update_eye_position()
+
+    def _update_eye_position(self):
+        """Update the eye position based on the current direction"""
+        if self.eye_direction == 'r':  # Right
+            self.eye_x = self.x + self.radius * 0.7
+            self.eye_y = self.y
+        elif self.eye_direction == 'l':  # Left
+            self.eye_x = self.x - self.radius * 0.7
+            self.eye_y = self.y
+        elif self.eye_direction == 'u':  # Up
+            self.eye_x = self.x
+            self.eye_y = self.y - self.radius * 0.7
+        elif self.eye_direction == 'd':  # Down
+            self.eye_x = self.x
+            self.eye_y = self.y + self.radius * 0.7
+
+    # ---------- Basic Movements ----------
+    def _move_up(self):
+        if self.animating: return False
+        if self.grid_y > 0 and self.grid.get(self.grid_x, self.grid_y - 1) == EMPTY:
+            self.grid.set(self.grid_x, self.grid_y, EMPTY)
+            self.grid_y -= 1
+            self.grid.set(self.grid_x, self.grid_y, ROBOT)
+            self.target_y = (self.grid_y + 0.5) * self.grid.cell_size
+            if self.index is not None:
+                self.index.update(self)
+            self.animating = True
+            self.eye_direction = 'u'  # Set eye direction to up
+            self._update_eye_position()
+            return True
+        return False
+
+    def _move_down(self):
+        if self.animating: return False
+        if self.grid_y < self.grid.rows - 1 and self.grid.get(self.grid_x, self.grid_y + 1) == EMPTY:
+            self.grid.set(self.grid_x, self.grid_y, EMPTY)
+            self.grid_y += 1
+            self.grid.set(self.grid_x, self.grid_y, ROBOT)
+            self.target_y = (self.grid_y + 0.5) * self.grid.cell_size
+            if self.index is not None:
+                self.index.update(self)
+            self.animating = True
+            self.eye_direction = 'd'  # Set eye direction to down
+            self._update_eye_position()
+            return True
+        return False
+
+    def _move_left(self):
+        if self.animating: return False
+        if self.grid_x > 0 and self.grid.get(self.grid_x - 1, self.grid_y) == EMPTY:
+            self.grid.set(self.grid_x, self.grid_y, EMPTY)
+            self.grid_x -= 1
+            self.grid.set(self.grid_x, self.grid_y, ROBOT)
+            self.target_x = (self.grid_x + 0.5) * self.grid.cell_size
+            if self.index is not None:
+                self.index.update(self)
+            self.animating = True
+            self.eye_direction = 'l'  # Set eye direction to left
+            self._update_eye_position()
+            return True
+        return False
+
+    def _move_right(self):
+        if self.animating: return False
+        if self.grid_x < self.grid.cols - 1 and self.grid.get(self.grid_x + 1, self.grid_y) == EMPTY:
+            self.grid.set(self.grid_x, self.grid_y, EMPTY)
+            self.grid_x += 1
+            self.grid.set(self.grid_x, self.grid_y, ROBOT)
+            self.target_x = (self.grid_x + 0.5) * self.grid.cell_size
+            if self.index is not None:
+                self.index.update(self)
+            self.animating = True
+            self.eye_direction = 'r'  # Set eye direction to right
+            self._update_eye_position()
+            return True
+        return False
+
+    def move_randomly(self):
+        if self.animating: return
+        directions = [self._move_up, self._move_down, self._move_left, self._move_right]
+        self.rng.shuffle(directions)
+        for fn in directions:
+            if fn():
+                break
+
+    # ---------- Path Planning ----------
+    def compute_path(self, dest_x, dest_y):
+        start = (self.grid_x, self.grid_y)
+        goal = (dest_x, dest_y)
+        if self.path_repair:  # Keep the search so layout changes only repair it
+            self.planner = DStarLite(self.grid, start, goal)
+            return self.planner.path()
+        self.planner = None  # A search kept for an earlier route is of no use now
+        if self.heatmap is not None:  # Avoid congested cells when traffic is tracked
+            return weighted_path(self.grid, start, goal, self.heatmap.congestion_cost, COST_UNIT)
+        return bfs_path(self.grid, start, goal)
+
+    def move_to(self, dx, dy):
+        self.goal = (dx, dy)
+        if self.planning is not None and not self.path_repair and self.heatmap is None:
+            self.path = []
+            self.path_pending = True  # Filled in by the planning service's next flush
+            self.planning.request(self, dx, dy)
+            return
+        self.set_path(self.compute_path(dx, dy), (dx, dy))
+
+    def set_path(self, path, goal):
+        """Starts following a freshly planned path to goal"""
+        self.path = path
+        self.path_pending = False
+        self.recovery_stack = []
+        self.in_collision_avoidance = False
+        if self.journal.debug:
+            self.journal.emit(REPLAN, self.id, -1, goal[0], goal[1], len(self.path))
+        if self.routes is not None:
+            self.routes.subscribe(self)
+
+        # Set initial eye direction if there's a path
+        if self.path and not self.animating:
+            self.eye_direction = self.path[0]
+            self._update_eye_position()
+
+    @property
+    def arrived(self):
+        """True when the robot has nothing left to do on its way to its goal"""
+        return not self.animating and not self.path and not self.path_pending and self.escape is None
+
+    def route_cells(self):
+        """
+        Yields the cells the remaining path crosses, starting from where the
+        path resumes (the position before any pending collision-avoidance steps)
+        """
+        x, y = self.grid_x, self.grid_y
+        for d in reversed(self.recovery_stack):
+            dx, dy = MOVES[d]
+            x, y = x + dx, y + dy
+        for d in self.path:
+            dx, dy = MOVES[d]
+            x, y = x + dx, y + dy
+            yield x, y
+
+    def repair_path(self):
+        """
+        Replans to the current goal after the layout changed.
+
+        Repairs use D* Lite whatever planned the route: the robot's search
+        of the current goal (started by its first repair) is updated with the
+        changed cells and the robot's new position, so only the part of the
+        search the change invalidated is redone. Pending collision-avoidance steps
+        are dropped: the repaired path starts from the current cell.
+
+        Returns:
+        - True if the path changed, False if it is the same or the robot is
+          not following a path to its goal
+        """
+        if self.goal is None or not self.path:
+            return False
+        old_path = self.path
+        start = (self.grid_x, self.grid_y)
+        if self.planner is None or self.planner.goal != self.goal:
+            self.planner = DStarLite(self.grid, start, self.goal)
+        else:
+            self.planner.move_start(start)
+            self.planner.sync()
+        self.path = self.planner.path()
+        self.escape = None
+        self.recovery_stack = []
+        self.in_collision_avoidance = False
+        if self.journal.debug:
+            self.journal.emit(REPLAN, self.id, -1, self.goal[0], self.goal[1], len(self.path))
+        if self.routes is not None:
+            self.routes.subscribe(self)
+        return self.path != old_path
+
+    def reroute(self):
+        """
+        Replans to the current goal around the cells robots stand on now,
+        because a cell ahead is blocked for a long time (e.g. a parked robot).
+        D* Lite ignores robots, so robots repairing paths search plainly here.
+
+        Returns:
+        - True if the robot took another route, False if there is none (the
+          current path is kept) or it is not following a path to its goal
+        """
+        if self.goal is None or not self.path or self.escape is not None:
+            return False
+        start = (self.grid_x, self.grid_y)
+        if self.heatmap is not None:
+            path = weighted_path(self.grid, start, self.goal, self.heatmap.congestion_cost, COST_UNIT)
+        else:
+            path = bfs_path(self.grid, start, self.goal)
+        if not path:
+            return False
+        self.set_path(path, self.goal)
+        return True
+
+    def yield_along(self, path, hold):
+        """
+        Steps aside along an escape path to break a deadlock; the robot holds
+        on the escape cell for a few ticks and then replans to its goal.
+        """
+        self.escape = (self.goal, hold)
+        self.path = list(path)
+        self.recovery_stack = []
+        self.in_collision_avoidance = False
+        self.blocked_ticks = 0
+        if self.routes is not None:
+            self.routes.subscribe(self)
+        if self.path and not self.animating:
+            self.eye_direction = self.path[0]
+            self._update_eye_position()
+
+    # ---------- Collision Avoidance Helpers ----------
+    def can_move(self, d):
+        if self.animating: return False
+        deltas = {'u': (0, -1), 'd': (0, 1), 'l': (-1, 0), 'r': (1, 0)}
+        dx, dy = deltas[d]
+        nx, ny = self.grid_x + dx, self.grid_y + dy
+        return (
+                0 <= nx < self.grid.cols and
+                0 <= ny < self.grid.rows and
+                self.grid.get(nx, ny) == EMPTY
+        )
+
+    def call_move(self, d):
+        return {
+            'u': self._move_up,
+            'd': self._move_down,
+            'l': self._move_left,
+            'r': self._move_right,
+        }[d]()
+
+    def random_avoid_move(self):
+        dirs = list('udlr')
+        self.rng.shuffle(dirs)
+        opp = {'u': 'd', 'd': 'u', 'l': 'r', 'r': 'l'}  # Maps directions to their opposites
+        for d in dirs:
+            if self.can_move(d):
+                self.eye_direction = d  # Update eye direction before moving
+                self._update_eye_position()
+                if self.call_move(d):
+                    self.recovery_stack.append(opp[d])  # Add opposite move to recovery stack
+                break
+
+    def detour_move(self, d):
+        """
+        Takes a detour step in a chosen direction instead of following the path
+        (lets an external policy replace the random avoidance).
+
+        Returns:
+        - True if the robot moved; the step is undone through recovery_stack
+          before the path is resumed
+        """
+        if not self.can_move(d):
+            return False
+        opp = {'u': 'd', 'd': 'u', 'l': 'r', 'r': 'l'}
+        self.eye_direction = d
+        self._update_eye_position()
+        self.call_move(d)
+        if self.path:
+            self.recovery_stack.append(opp[d])
+            self.in_collision_avoidance = True
+        return True
+
+    def _route_shifted(self):
+        """
+        A failed backtrack step is dropped, so the rest of the path now
+        starts one cell off: the route crosses other cells than subscribed
+        """
+        if self.routes is not None:
+            self.routes.subscribe(self)
+
+    # ---------- Movement Execution with Collision Avoidance ----------
+    def perform_move(self):
+        if self.animating:
+            return
+        self.blocked_cell = None
+
+        # Collision avoidance mode - either avoiding obstacles or trying to get back on path
+        if self.in_collision_avoidance:
+            if self.path:
+                nd = self.path[0]
+                if self.can_move(nd):  # If original path is now clear
+                    if self.recovery_stack:  # First backtrack to original position
+                        backtrack_dir = self.recovery_stack.pop()
+                        self.eye_direction = backtrack_dir  # Update eye direction
+                        self._update_eye_position()
+                        if not self.call_move(backtrack_dir):
+                            self._route_shifted()
+                    else:  # Backtracking complete, resume normal path
+                        self.in_collision_avoidance = False
+                else:  # Path still blocked, continue random avoidance
+                    self.random_avoid_move()
+            else:  # No more path to follow, just get back to last position
+                if self.recovery_stack:
+                    backtrack_dir = self.recovery_stack.pop()
+                    self.eye_direction = backtrack_dir  # Update eye direction
+                    self._update_eye_position()
+                    if not self.call_move(backtrack_dir):
+                        self._route_shifted()
+                else:
+                    self.in_collision_avoidance = False
+            return
+
+        # Normal path following
+        if self.path:
+            d = self.path.pop(0)
+            self.eye_direction = d  # Update eye direction before attempting move
+            self._update_eye_position()
+            if not self.call_move(d):  # If move fails, wait or enter collision avoidance mode
+                self.path.insert(0, d)  # Put direction back in path
+                dx, dy = MOVES[d]
+                nx, ny = self.grid_x + dx, self.grid_y + dy
+                if 0 <= nx < self.grid.cols and 0 <= ny < self.grid.rows:
+                    if self.heatmap is not None:
+                        self.heatmap.record_blocked(nx, ny)
+                    if self.blocked_ticks < self.wait_ticks:  # Stay put; the deadlock resolver may step in
+                        self.blocked_ticks += 1
+                        self.blocked_cell = (nx, ny)
+                        return
+                self.blocked_ticks = 0
+                self.in_collision_avoidance = True
+                if self.journal.debug:
+                    self.journal.emit(AVOID, self.id, -1, self.grid_x, self.grid_y, 'udlr'.index(d))
+                self.random_avoid_move()  # Try random direction to avoid obstacle
+            else:
+                self.blocked_ticks = 0
+        elif self.escape is None:  # A yielding robot holds its escape cell instead
+            self.move_randomly()  # No path to follow, move randomly
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+Path-to-cell subscription index.
+
+Every time a robot gets a new route (a planned path, a repair or an escape)
+it subscribes to the cells the route crosses. When a cell becomes blocked
+for a long time, subscribers(x, y) gives exactly the robots that would run
+into it, so only those replan instead of the whole fleet.
+
+Subscriptions are not withdrawn cell by cell as a robot advances: a query
+checks each subscriber's remaining route and drops those that no longer
+cross the cell. A robot's subscriptions are replaced when its route is.
+
+The index also watches for parked robots: a robot that has not left its
+cell for park_ticks move rounds (waiting in a docking queue, boxed in, held
+by a deadlock) blocks that cell for the robots routed through it.
+"""
+from array import array
+
+
+class RouteIndex:
+    def __init__(self, cols, rows):
+        """
+        Initializes an empty index.
+
+        Parameters:
+        - cols, rows: size of the grid in cells
+        """
+        self.cols = cols
+        self.rows = rows
+        self._subscribers = {}  # Cell index -> set of robots routed through it
+        self._cells = {}  # Robot -> cell indices it subscribed to
+
+        # Parked robot watch (see watch_parking)
+        self.park_ticks = 0  # Move rounds without moving after which a robot is parked; 0: not watched
+        self.still_ticks = array('I')  # Per robot: consecutive move rounds on the same cell
+        self._last_cell = array('i')  # Per robot: cell index after the previous move round
+
+        # Counters
+        self.parked = 0  # Robots that became parked
+        self.notified = 0  # Subscribers found for blocked cells
+        self.replanned = 0  # Of which got another route
+
+    def subscribe(self, robot):
+        """Subscribes a robot to the cells of its remaining route (replacing older subscriptions)"""
+        self.unsubscribe(robot)
+        cols = self.cols
+        cells = [y * cols + x for x, y in robot.route_cells()]
+        if not cells:
+            return
+        self._cells[robot] = cells
+        for c in cells:
+            subs = self._subscribers.get(c)
+            if subs is None:
+                self._subscribers[c] = {robot}
+            else:
+                subs.add(robot)
+
+    def unsubscribe(self, robot):
+        """Withdraws all subscriptions of a robot"""
+        for c in self._cells.pop(robot, ()):
+            subs = self._subscribers.get(c)
+            if subs is not None:
+                subs.discard(robot)
+                if not subs:
+                    del self._subscribers[c]
+
+    def subscribers(self, x, y):
+        """
+        Returns the robots whose remaining route crosses cell (x, y), in
+        robot id order; subscriptions the robots have moved past are dropped.
+        """
+        subs = self._subscribers.get(y * self.cols + x)
+        if not subs:
+            return []
+        found = []
+        for r in sorted(subs, key=lambda r: r.id):
+            if (x, y) in r.route_cells():
+                found.append(r)
+            else:
+                subs.discard(r)
+        if not subs:
+            del self._subscribers[y * self.cols + x]
+        return found
+
+    def __len__(self):
+        """Number of live (cell, robot) subscriptions, stale ones included"""
+        return sum(len(s) for s in self._subscribers.values())
+
+    # ---------- Parked robots ----------
+    def watch_parking(self, robots, park_ticks):
+        """Starts counting how long each robot stays on its cell"""
+        self.park_ticks = park_ticks
+        self.still_ticks = array('I', bytes(4 * len(robots)))
+        self._last_cell = array('i', [r.grid_y * self.cols + r.grid_x for r in robots])
+
+    def record_tick(self, robots):
+        """
+        Updates the still counters after a move round.
+
+        Returns:
+        - the robots that have just been on their cell for park_ticks rounds
+        """
+        parked = []
+        cols, still, last = self.cols, self.still_ticks, self._last_cell
+        for r in robots:
+            c = r.grid_y * cols + r.grid_x
+            if c != last[r.id]:
+                last[r.id] = c
+                still[r.id] = 0
+                continue
+            still[r.id] += 1
+            if still[r.id] == self.park_ticks:
+                parked.append(r)
+        self.parked += len(parked)
+        return parked
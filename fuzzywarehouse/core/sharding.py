@@ -0,0 +1,327 @@
+"""
+Sharded multi-process simulation of large floors.
+
+The grid is split into rx x ry rectangular regions. The cell layer lives in
+shared memory, and each region has a worker process that owns the robots in
+its interior. Each tick runs in two phases:
+1. Interior robots (not on a region's border cells) move, every region in
+   parallel. A robot only touches its own cell and its four neighbours,
+   which all lie in its region, so regions cannot interfere.
+2. Band robots (on a border cell) move in the main process, one after
+   another, since they can meet robots of the neighbouring region.
+The main process (the coordinator) keeps the full Simulation. It runs
+spawning, dispatch, pickups and deliveries, deadlock resolution and
+traffic exactly as before, and mirrors every robot.
+
+Ordering rule: within a tick, interior robots move before band robots, each
+group in robot id order. Robots draw detours from their own random streams
+(Simulation.use_robot_streams). A single-process Simulation whose
+move_order is RegionMap.move_order therefore produces the same states,
+events and counters as the sharded run for the same seed.
+
+Synchronization happens at the tick barrier, in one message per worker and
+one reply:
+- coordinator -> worker: robots handed to the worker (full record and
+  random state), robots the coordinator changed since the last reply
+  (new paths, yields, repairs), detours and the journal level
+- worker -> coordinator: the record of every robot it moved, its failed
+  moves and journal events, the robots whose route changed (so the
+  coordinator's route index follows them), and the robots it hands back
+  (full record and random state) because they stepped onto a border cell
+"""
+import multiprocessing
+import random
+from array import array
+
+from .grid import Grid
+from .robot import Robot
+
+
+class RegionMap:
+    def __init__(self, cols, rows, rx, ry):
+        """
+        Splits a grid into rx x ry regions.
+
+        Parameters:
+        - cols, rows: size of the grid in cells
+        - rx, ry: number of regions across and down
+        """
+        self.cols = cols
+        self.rows = rows
+        self.rx = rx
+        self.ry = ry
+        xs = [cols * i // rx for i in range(rx + 1)]
+        ys = [rows * j // ry for j in range(ry + 1)]
+        self.bounds = [(xs[i], ys[j], xs[i + 1], ys[j + 1]) for j in range(ry) for i in range(rx)]
+        # Region of every cell, or -1 for border cells next to another region
+        self.cell_region = array('h', [-1]) * (cols * rows)
+        for k, (x0, y0, x1, y1) in enumerate(self.bounds):
+            left = x0 + (x0 > 0)
+            right = x1 - (x1 < cols)
+            top = y0 + (y0 > 0)
+            bottom = y1 - (y1 < rows)
+            for y in range(top, bottom):
+                row = y * cols
+                self.cell_region[row + left:row + right] = array('h', [k]) * (right - left)
+
+    def region(self, x, y):
+        """Region whose interior holds cell (x, y), or -1 on a border"""
+        return self.cell_region[y * self.cols + x]
+
+    def move_order(self, robots):
+        """The ordering rule: interior robots, then band robots, each by id"""
+        interior = []
+        band = []
+        for r in sorted(robots, key=lambda r: r.id):
+            (band if self.cell_region[r.grid_y * self.cols + r.grid_x] < 0 else interior).append(r)
+        return interior + band
+
+
+def robot_record(r):
+    """Everything a worker needs to move a robot (sent on handoff and when the coordinator replans it)"""
+    return (r.grid_x, r.grid_y, r.x, r.y, r.target_x, r.target_y, r.animating, r.eye_direction,
+            tuple(r.path), tuple(r.recovery_stack), r.in_collision_avoidance, r.wait_ticks,
+            r.blocked_ticks, r.blocked_cell, r.escape)
+
+
+def apply_record(r, rec):
+    (r.grid_x, r.grid_y, r.x, r.y, r.target_x, r.target_y, r.animating, r.eye_direction,
+     path, stack, r.in_collision_avoidance, r.wait_ticks, r.blocked_ticks, r.blocked_cell, r.escape) = rec
+    r.path = list(path)
+    r.recovery_stack = list(stack)
+    r._update_eye_position()
+
+
+def move_record(r):
+    """
+    What a move round changed. Moves only take steps off the front of the
+    path, so its length stands for the path itself.
+    """
+    return (r.grid_x, r.grid_y, r.x, r.y, r.target_x, r.target_y, r.animating, r.eye_direction,
+            len(r.path), tuple(r.recovery_stack), r.in_collision_avoidance, r.blocked_ticks, r.blocked_cell)
+
+
+def apply_move_record(r, rec):
+    (r.grid_x, r.grid_y, r.x, r.y, r.target_x, r.target_y, r.animating, r.eye_direction,
+     path_len, stack, r.in_collision_avoidance, r.blocked_ticks, r.blocked_cell) = rec
+    del r.path[:len(r.path) - path_len]  # In place: the list identity marks coordinator replans
+    r.recovery_stack[:] = stack
+    r._update_eye_position()
+
+
+class ShardedSimulation:
+    def __init__(self, sim, regions=(2, 2)):
+        """
+        Runs a simulation with its regions simulated by worker processes.
+
+        The simulation's grid layer is moved into shared memory until close().
+        Use the sharded object's step()/run() to advance it; every other part
+        of the Simulation API (dispatch, injection, runtime obstacles,
+        observation) is used on sim directly between ticks. Take snapshots
+        or forks after close(), which brings back the robots' random streams.
+
+        Parameters:
+        - sim: the Simulation to run; its robots need their own random streams
+          (sim.use_robot_streams(seed))
+        - regions: (rx, ry) number of regions across and down, one worker each
+        """
+        if not sim.robot_streams:
+            raise ValueError("Sharded simulation needs per-robot random streams (use_robot_streams)")
+        self.sim = sim
+        grid = sim.grid
+        self.regions = RegionMap(grid.cols, grid.rows, *regions)
+        self.shm = grid.share()
+        self.conns = []
+        self.workers = []
+        for k in range(len(self.regions.bounds)):
+            parent, child = multiprocessing.Pipe()
+            proc = multiprocessing.Process(
+                target=_region_worker, daemon=True,
+                args=(child, self.shm.name, grid.width, grid.height, grid.cell_size,
+                      self.regions.rx, self.regions.ry, k))
+            proc.start()
+            child.close()
+            self.conns.append(parent)
+            self.workers.append(proc)
+        self.owner = {r.id: -1 for r in sim.robots}  # Robot id -> owning region (-1: coordinator)
+        # Robot id -> (path list, escape, wait_ticks) its worker last saw; the
+        # coordinator only changes a worker's robot by replacing its path or
+        # through those fields, so comparing them finds the robots to update
+        self.synced = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def step(self, detours=None):
+        """Advances the simulation by one tick (same phases as Simulation.step)"""
+        sim = self.sim
+        if sim.tick % sim.item_interval == 0:
+            sim.spawn_items()
+        if sim.auto_assign:
+            sim.assign_pending()
+        self.move_robots(detours)
+        for r in sim.robots:
+            r.settle()
+        sim.complete_tasks()
+        for o in sim.observers:
+            o.on_tick(sim)
+
+    def run(self, ticks):
+        """Runs the given number of ticks"""
+        for _ in range(ticks):
+            self.step()
+
+    def move_robots(self, detours=None):
+        """One move round: interior robots in the workers, then band robots here"""
+        sim = self.sim
+        sim.flush_plans()
+        regions = self.regions
+        robots = sim.robots
+        n = len(self.conns)
+        handoffs = [[] for _ in range(n)]
+        updates = [[] for _ in range(n)]
+        worker_detours = [{} for _ in range(n)]
+        band = [r for r in robots if regions.region(r.grid_x, r.grid_y) < 0]
+
+        # Hand interior robots to their region and push the coordinator's changes
+        for r in robots:
+            k = regions.region(r.grid_x, r.grid_y)
+            if k < 0:
+                continue
+            if self.owner[r.id] != k:
+                self.owner[r.id] = k
+                handoffs[k].append((r.id, r.radius, robot_record(r), r.rng.getstate()))
+            else:
+                path, escape, wait_ticks = self.synced[r.id]
+                if r.path is not path or r.escape != escape or r.wait_ticks != wait_ticks:
+                    updates[k].append((r.id, robot_record(r)))
+            self.synced[r.id] = (r.path, r.escape, r.wait_ticks)
+            if detours and r.id in detours:
+                worker_detours[k][r.id] = detours[r.id]
+
+        debug = sim.journal.debug
+        traffic = sim.heatmap is not None
+        for k, conn in enumerate(self.conns):
+            conn.send(("tick", (handoffs[k], updates[k], worker_detours[k], debug, traffic)))
+
+        # Phase 1 results, applied in robot id order as the ordering rule requires
+        events = []
+        blocked = []
+        for conn in self.conns:
+            records, released, worker_events, worker_blocked, routed = conn.recv()
+            for rid, rec in records.items():
+                r = robots[rid]
+                apply_move_record(r, rec)
+                if r.index is not None:
+                    r.index.update(r)
+            for rid in routed:
+                r = robots[rid]
+                if r.routes is not None:
+                    r.routes.subscribe(r)
+            for rid, rng_state in released:
+                robots[rid].rng.setstate(rng_state)
+                self.owner[rid] = -1
+                del self.synced[rid]
+            events.extend(worker_events)
+            blocked.extend(worker_blocked)
+        if sim.heatmap is not None:
+            for _, x, y in sorted(blocked, key=lambda b: b[0]):
+                sim.heatmap.record_blocked(x, y)
+        for event in sorted(events, key=lambda e: e[1]):
+            sim.journal.emit(*event)
+
+        # Phase 2: band robots, one after another
+        for r in band:
+            if detours and r.id in detours:
+                r.detour_move(detours[r.id])
+            else:
+                r.perform_move()
+        sim.finish_moves()
+
+    def close(self):
+        """
+        Stops the workers, taking back the random streams of the robots they
+        owned, and moves the grid layer back into private memory
+        """
+        if self.shm is None:
+            return
+        for conn in self.conns:
+            conn.send(("close", None))
+        for conn in self.conns:
+            for rid, rng_state in conn.recv().items():
+                self.sim.robots[rid].rng.setstate(rng_state)
+            conn.close()
+        for proc in self.workers:
+            proc.join()
+        self.sim.grid.unshare(self.shm)
+        self.shm = None
+
+
+class _MoveLog:
+    """Collects a worker's journal events, failed moves and route changes for the coordinator"""
+
+    info = False
+
+    def __init__(self, debug):
+        self.debug = debug
+        self.events = []
+        self.blocked = []
+        self.routed = []  # Robots whose route changed, to resubscribe in the coordinator
+        self.actor = -1
+
+    def emit(self, *event):
+        self.events.append(event)
+
+    def record_blocked(self, x, y):
+        self.blocked.append((self.actor, x, y))
+
+    def subscribe(self, robot):
+        self.routed.append(robot.id)
+
+
+def _region_worker(conn, shm_name, width, height, cell_size, rx, ry, region):
+    grid, shm = Grid.attach(shm_name, width, height, cell_size)
+    regions = RegionMap(grid.cols, grid.rows, rx, ry)
+    robots = {}  # Robots owned by this worker, by id
+    traffic = False
+    while True:
+        cmd, arg = conn.recv()
+        if cmd != "tick":
+            break
+        handoffs, updates, detours, debug, traffic = arg
+        for rid, radius, rec, rng_state in handoffs:
+            r = Robot(rec[0], rec[1], radius, grid)
+            r.id = rid
+            r.rng = random.Random()
+            r.rng.setstate(rng_state)
+            apply_record(r, rec)
+            robots[rid] = r
+        for rid, rec in updates:
+            apply_record(robots[rid], rec)
+
+        log = _MoveLog(debug)
+        for rid in sorted(robots):
+            r = robots[rid]
+            r.journal = log
+            r.heatmap = log if traffic else None
+            r.routes = log
+            log.actor = rid
+            if detours and rid in detours:
+                r.detour_move(detours[rid])
+            else:
+                r.perform_move()
+            r.settle()
+
+        records = {rid: move_record(r) for rid, r in robots.items()}
+        released = []
+        for rid in [rid for rid, r in robots.items() if regions.region(r.grid_x, r.grid_y) != region]:
+            released.append((rid, robots.pop(rid).rng.getstate()))
+        conn.send((records, released, log.events, log.blocked, log.routed))
+    conn.send({rid: r.rng.getstate() for rid, r in robots.items()})
+    robots.clear()
+    grid.cells.release()
+    shm.close()
+    conn.close()
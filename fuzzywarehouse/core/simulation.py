@@ -0,0 +1,473 @@
+import random
+
+from .robot import Robot, FREE, PICKUP, DELIVERING
+from .itemgenerator import ItemGenerator
+from .obstaclegenerator import ObstacleGenerator
+from .dropzone import DropZone
+from .grid import Grid, EMPTY
+from .spatial import SpatialIndex
+from .traffic import TrafficHeatmap
+from .deadlock import DeadlockResolver, robot_priority
+from .planning import PlanningService
+from .kpi import KpiTracker
+from .ledger import ItemLedger
+from .routes import RouteIndex
+from .journal import NULL_JOURNAL, SPAWN, ASSIGN, PICKUP as PICKUP_EVENT, DELIVER
+
+# One tick is one round of robot moves (main() moves every 500 ms)
+TICK_SECONDS = 0.5
+# Ticks between item generation attempts (main() tries every 2000 ms)
+ITEM_INTERVAL = 4
+# Default floor, in pixels, used by main() with and without a window
+GRID_WIDTH, GRID_HEIGHT = 640, 480  # Reduced from 800x600
+CELL_SIZE = 40  # Reduced from 50
+
+
+def find_nearest_free(robot, tx, ty, grid):
+    """Returns the free neighboring cell (udlr) of (tx,ty) closest to the robot."""
+    cands = []
+    for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
+        nx, ny = tx + dx, ty + dy
+        if grid.is_free(nx, ny):
+            cands.append((nx, ny))
+    if not cands:
+        return None
+    return min(cands, key=lambda p: abs(p[0] - robot.grid_x) + abs(p[1] - robot.grid_y))
+
+
+class Simulation:
+    def __init__(self, grid, generators, dropzones, robots, rng=None, item_interval=ITEM_INTERVAL,
+                 journal=None, items=None):
+        """
+        Holds the complete state of a warehouse and advances it tick by tick.
+
+        Parameters:
+        - grid: the Grid shared by every entity
+        - generators: list of ItemGenerator
+        - dropzones: list of DropZone (names must match the fuzzy zones)
+        - robots: list of Robot
+        - rng: random source shared by the entities (defaults to the random module)
+        - item_interval: ticks between item generation attempts in step()
+        - journal: EventJournal receiving lifecycle events (disabled by default)
+        - items: ItemLedger recording every item (a new empty one by default)
+        """
+        self.grid = grid
+        self.generators = generators
+        self.dropzones = dropzones
+        self.robots = robots
+        self.rng = rng or random
+        self.item_interval = item_interval
+
+        self.pending = []  # Generators with items waiting for a robot
+        self.tick = 0  # Number of completed move rounds
+        self.layout = None  # Layout the simulation was built from, if any
+        self.zones_by_name = {z.name: z for z in dropzones}
+        self.heatmap = None  # TrafficHeatmap, see enable_traffic()
+        self.auto_assign = True  # step() dispatches pending items; turn off for external dispatch
+        self.obstacles = ObstacleGenerator(grid, obstacle_ratio=0.0, rng=self.rng)  # Runtime layout changes
+        self.path_repair = False  # See enable_path_repair()
+        self.deadlocks = None  # DeadlockResolver, see enable_deadlock_resolution()
+        self.move_order = None  # Optional function(robots) giving the order robots move in
+        self.robot_streams = False  # Robots draw from their own random streams, see use_robot_streams()
+        self.planning = None  # PlanningService, see enable_planning_service()
+        self.observers = []  # Called with the simulation after every step(), see add_observer()
+        self.kpis = None  # KpiTracker, see enable_kpis()
+
+        # Items are rows of the ledger; generators and robots hold their ids
+        self.items = items if items is not None else ItemLedger()
+        for i, gen in enumerate(generators):
+            gen.id = i
+            gen.items = self.items
+
+        # Robots are identified by their position in the list and filed in a
+        # spatial index (grouped by state) that their moves keep up to date,
+        # and subscribe to the cells of their routes
+        self.robot_index = SpatialIndex(grid.cols, grid.rows)
+        self.routes = RouteIndex(grid.cols, grid.rows)
+        for i, r in enumerate(robots):
+            r.id = i
+            r.index = self.robot_index
+            self.robot_index.insert(r)
+            r.routes = self.routes
+            if r.path:
+                self.routes.subscribe(r)
+        self.set_journal(journal or NULL_JOURNAL)
+
+    def set_journal(self, journal):
+        """Routes the events of the simulation and its robots to a journal"""
+        self.journal = journal
+        journal.tick = self.tick
+        for r in self.robots:
+            r.journal = journal
+
+    def add_observer(self, observer):
+        """
+        Calls observer.on_tick(sim) after every step(), e.g. a renderer or a
+        frame recorder from render/capture.py. Returns the observer.
+        """
+        self.observers.append(observer)
+        return observer
+
+    def remove_observer(self, observer):
+        self.observers.remove(observer)
+
+    def enable_traffic(self, decay=0.95, fail_weight=4.0, weight=0.05):
+        """Starts tracking traffic; robots then plan congestion-weighted paths"""
+        self.set_heatmap(TrafficHeatmap(self.grid.cols, self.grid.rows, decay, fail_weight, weight))
+        return self.heatmap
+
+    def set_heatmap(self, heatmap):
+        """Shares a heatmap (or None to plan plain shortest paths) with every robot"""
+        self.heatmap = heatmap
+        for r in self.robots:
+            r.heatmap = heatmap
+
+    def use_robot_streams(self, seed):
+        """
+        Gives every robot its own random stream derived from seed, so the
+        random detours of one robot do not depend on how many draws other
+        robots made before it (required to simulate regions in parallel).
+        """
+        self.robot_streams = True
+        for r in self.robots:
+            r.rng = random.Random(f"{seed}:{r.id}")
+
+    def enable_planning_service(self, workers=None, kind="process", min_batch=4):
+        """
+        Batches the path searches of each phase on a worker pool (see
+        planning.py). Returns the PlanningService; close() it when done.
+        """
+        self.planning = PlanningService(self.grid, workers, kind, min_batch)
+        for r in self.robots:
+            r.planning = self.planning
+        return self.planning
+
+    def flush_plans(self):
+        """Hands out the paths of all move_to() requests waiting for the planning service"""
+        if self.planning is not None:
+            self.planning.flush()
+
+    def enable_kpis(self, accuracy=0.02):
+        """
+        Starts aggregating item latencies (per zone, generator and robot),
+        throughput and robot utilisation (see kpi.py). Returns the KpiTracker.
+        """
+        self.kpis = KpiTracker([z.name for z in self.dropzones], len(self.generators), len(self.robots),
+                               TICK_SECONDS, accuracy)
+        return self.kpis
+
+    def enable_deadlock_resolution(self, wait_ticks=3, escape_radius=8, horizon=12, hold_ticks=2):
+        """
+        Makes blocked robots wait instead of wandering off at once, and breaks
+        cycles of waiting robots by letting the lowest-priority one yield
+        (see deadlock.py). Returns the DeadlockResolver with the counters.
+        """
+        self.deadlocks = DeadlockResolver(self.robot_index, self.grid, self.items, wait_ticks, escape_radius,
+                                          horizon, hold_ticks)
+        for r in self.robots:
+            r.wait_ticks = wait_ticks
+        return self.deadlocks
+
+    def enable_park_replanning(self, park_ticks=6):
+        """
+        Treats a robot that has not moved for park_ticks move rounds as a
+        long-term block: the robots whose route crosses its cell replan
+        around it at once instead of running into it (see routes.py).
+        """
+        self.routes.watch_parking(self.robots, park_ticks)
+
+    def replan_around(self, x, y):
+        """
+        Replans the robots whose remaining route crosses cell (x, y), highest
+        priority first, around the robots standing on the grid now.
+
+        Returns:
+        - the number of robots that took another route
+        """
+        subs = sorted(self.routes.subscribers(x, y), key=lambda r: robot_priority(r, self.items), reverse=True)
+        done = sum(r.reroute() for r in subs)
+        self.routes.notified += len(subs)
+        self.routes.replanned += done
+        return done
+
+    def enable_path_repair(self):
+        """
+        Makes robots plan every new goal with D* Lite and keep the search, so
+        even the first runtime layout change only repairs prior searches, and
+        an opened cell shortens every route it can.
+
+        Opt-in: D* Lite uses unit costs and ignores robots, so with it the
+        traffic heatmap and the planning service no longer plan new goals.
+        Without it, robots keep their configured planner, and D* Lite is only
+        used to repair the routes a layout change affects.
+        """
+        self.path_repair = True
+        for r in self.robots:
+            r.path_repair = True
+
+    def add_obstacle(self, x, y):
+        """
+        Closes cell (x, y) at runtime (e.g. an aisle closed mid-shift).
+
+        The cell must be empty and the change must keep every generator and
+        drop zone connected, as ObstacleGenerator guarantees at startup.
+        Robots whose remaining route crosses the cell (found through the
+        route index) repair it with D* Lite, highest priority first; other
+        robots and new goals keep the configured planner.
+
+        Returns:
+        - True if the obstacle was placed, False if it was refused
+        """
+        if not self.obstacles.add_obstacle(x, y, *self._station_cells()):
+            return False
+        subs = sorted(self.routes.subscribers(x, y), key=lambda r: robot_priority(r, self.items), reverse=True)
+        done = sum(r.repair_path() for r in subs)
+        self.routes.notified += len(subs)
+        self.routes.replanned += done
+        return True
+
+    def remove_obstacle(self, x, y):
+        """
+        Reopens an obstacle cell at runtime. Every route stays valid; with
+        enable_path_repair() robots also repair theirs, since the opening may
+        give them a shorter one.
+
+        Returns:
+        - True if the cell held an obstacle
+        """
+        if not self.obstacles.remove_obstacle(x, y):
+            return False
+        if self.path_repair:
+            for r in self.robots:
+                if r.path:
+                    r.repair_path()
+        return True
+
+    def _station_cells(self):
+        """Cells of the generators and of the drop zones"""
+        return [(g.grid_x, g.grid_y) for g in self.generators], [(z.grid_x, z.grid_y) for z in self.dropzones]
+
+    @classmethod
+    def create(cls, width, height, cell_size, n_generators=4, n_dropzones=5, n_robots=4,
+               obstacle_ratio=0.15, seed=None, journal=None):
+        """Builds the default layout: generators on the left, drop zones on the right,
+        robots at random positions and random obstacles."""
+        rng = random.Random(seed)
+        grid = Grid(width, height, cell_size)
+
+        # Setup item generators along the left side
+        generators = []
+        for i in range(n_generators):
+            gy = i * 3 + 2
+            if gy < grid.rows:
+                generators.append(ItemGenerator(0, gy, grid, rng))
+
+        # Setup delivery zones along the right side
+        dropzones = []
+        right = grid.cols - 1
+        spacing = grid.rows // 6
+        for i in range(n_dropzones):
+            gy = (i + 1) * spacing
+            if gy < grid.rows:
+                dropzones.append(DropZone(right, gy, grid, name=f"Z{i + 1}"))
+
+        # Create robots at random positions
+        robots = []
+        used = set()
+        while len(robots) < n_robots:
+            gx = rng.randint(2, grid.cols - 3)
+            gy = rng.randint(0, grid.rows - 1)
+            if (gx, gy) not in used and grid.get(gx, gy) == EMPTY:
+                used.add((gx, gy))
+                robots.append(Robot(gx, gy, cell_size // 3, grid, rng))
+
+        # Generate obstacles randomly throughout the grid
+        ObstacleGenerator(grid, obstacle_ratio=obstacle_ratio, rng=rng).generate_obstacles()
+
+        return cls(grid, generators, dropzones, robots, rng, journal=journal)
+
+    @classmethod
+    def from_layout(cls, layout, cell_size=40, seed=None, journal=None):
+        """
+        Builds a simulation from a Layout (see layout.py).
+
+        The grid uses layout.cells directly (for a binary layout this is the
+        copy-on-write memory map), so a layout object should back a single
+        simulation; load it again for another one. Raises ValueError unless
+        the layout has exactly the drop zones Z1 to Z5 and robots can serve
+        every station (see Layout.check_reachable).
+        """
+        layout.check_zones()
+        layout.check_reachable()
+        rng = random.Random(seed)
+        grid = Grid(layout.cols * cell_size, layout.rows * cell_size, cell_size, layout.cells)
+        generators = [ItemGenerator(x, y, grid, rng) for x, y in layout.generators]
+        dropzones = [DropZone(x, y, grid, name=name) for x, y, name in layout.dropzones]
+        robots = [Robot(x, y, cell_size // 3, grid, rng) for x, y in layout.robots]
+        sim = cls(grid, generators, dropzones, robots, rng, journal=journal)
+        sim.layout = layout
+        return sim
+
+    # ---------- Tick phases ----------
+    def spawn_items(self):
+        """Lets every generator try to produce an item"""
+        for i, gen in enumerate(self.generators):
+            item = gen.generate_item(self.tick)
+            if item is not None:
+                self.pending.append(gen)
+                if self.journal.info:
+                    self.journal.emit(SPAWN, i, -1, gen.grid_x, gen.grid_y, *self.items.attributes(item))
+
+    def nearest_free_robots(self, x, y, k=1):
+        """Returns up to k free robots closest to (x, y), nearest first"""
+        return self.robot_index.nearest(x, y, k, group=FREE)
+
+    def robots_within(self, x, y, radius):
+        """Returns the robots within Manhattan distance radius of (x, y)"""
+        return self.robot_index.within(x, y, radius)
+
+    def inject_item(self, gen, size, fragility, priority):
+        """
+        Places an item with the given attributes on a generator.
+
+        Returns:
+        - True if the item was placed
+        - False if the generator already holds an item
+        """
+        if gen.place_item(size, fragility, priority, self.tick) is None:
+            return False
+        self.pending.append(gen)
+        if self.journal.info:
+            self.journal.emit(SPAWN, gen.id, -1, gen.grid_x, gen.grid_y, size, fragility, priority)
+        return True
+
+    def assign(self, free_r, gen):
+        """
+        Sends a free robot to pick up the item waiting at a generator.
+
+        Returns:
+        - True if the robot was given a path to the generator
+        - False otherwise (the item stays pending)
+        """
+        if free_r.state != FREE or gen not in self.pending:
+            return False
+        # Find available adjacent cell to the generator (all may be taken by robots)
+        dest = find_nearest_free(free_r, gen.grid_x, gen.grid_y, self.grid)
+        if not dest:
+            return False
+        # The robot takes charge of the item (it stays on the generator until pickup)
+        free_r.item_id = gen.item_id
+        self.items.assign(gen.item_id, free_r.id, self.tick)
+        free_r.set_state(PICKUP)
+        free_r.pickup_target = gen
+        if self.journal.info:
+            self.journal.emit(ASSIGN, free_r.id, self.generators.index(gen), free_r.grid_x, free_r.grid_y)
+        free_r.move_to(dest[0], dest[1])
+        self.pending.remove(gen)
+        return True
+
+    def assign_pending(self):
+        """Assigns pickup tasks to the nearest free robots"""
+        for gen in self.pending[:]:
+            found = self.nearest_free_robots(gen.grid_x, gen.grid_y)
+            if found:
+                self.assign(found[0], gen)
+        self.flush_plans()
+
+    def move_robots(self, detours=None):
+        """
+        Performs one move for every robot.
+
+        Parameters:
+        - detours: optional {robot id: direction} of detour steps chosen by a
+          controller; those robots take the detour instead of their usual move
+        """
+        self.flush_plans()  # Paths requested outside the tick phases (e.g. assign())
+        for r in (self.move_order(self.robots) if self.move_order else self.robots):
+            if detours and r.id in detours:
+                r.detour_move(detours[r.id])
+            else:
+                r.perform_move()
+        self.finish_moves()
+
+    def finish_moves(self):
+        """Closes a move round: deadlock resolution, parked robots, traffic and the tick counter"""
+        if self.deadlocks is not None:
+            self.deadlocks.update(self.robots, self.journal)
+        if self.routes.park_ticks:
+            for r in self.routes.record_tick(self.robots):
+                self.replan_around(r.grid_x, r.grid_y)
+        if self.heatmap is not None:
+            self.heatmap.record_tick(self.robots)
+        if self.kpis is not None:
+            self.kpis.record_tick(self.robots)
+        self.tick += 1
+        self.journal.tick = self.tick
+
+    def complete_tasks(self):
+        """Handles pickups and deliveries of robots that reached their targets"""
+        for r in self.robots:
+            # If robot reached generator neighbor → perform pickup
+            if r.state == PICKUP and r.arrived:
+                gen = r.pickup_target
+                gen.remove_item()
+                # Use fuzzy logic to decide which zone to deliver to
+                zone = self.items.classify_one(r.item_id)
+                dz = self.zones_by_name[zone]
+                self.items.pickup(r.item_id, self.dropzones.index(dz), self.tick)
+                r.set_state(DELIVERING)
+                r.delivery_target = dz
+                if self.journal.info:
+                    self.journal.emit(PICKUP_EVENT, r.id, self.dropzones.index(dz), r.grid_x, r.grid_y)
+                d2 = find_nearest_free(r, dz.grid_x, dz.grid_y, self.grid)
+                if d2:
+                    r.move_to(d2[0], d2[1])
+        self.flush_plans()  # Deliveries below need the paths planned for the pickups
+
+        for r in self.robots:
+            # If robot reached delivery zone neighbor → complete delivery
+            if r.state == DELIVERING and r.arrived:
+                # Add item to the dropzone counter
+                r.delivery_target.add_item()
+                self.items.deliver(r.item_id, self.tick)
+                if self.kpis is not None:
+                    self.kpis.delivered(self.items, r.item_id)
+                if self.journal.info:
+                    self.journal.emit(DELIVER, r.id, self.dropzones.index(r.delivery_target), r.grid_x, r.grid_y)
+                r.item_id = None
+                r.pickup_target = None
+                r.delivery_target = None
+                r.set_state(FREE)
+
+    def step(self, detours=None):
+        """Advances the simulation by one tick without any rendering (see move_robots for detours)"""
+        if self.tick % self.item_interval == 0:
+            self.spawn_items()
+        if self.auto_assign:
+            self.assign_pending()
+        self.move_robots(detours)
+        for r in self.robots:
+            r.settle()
+        self.complete_tasks()
+        for o in self.observers:
+            o.on_tick(self)
+
+    def run(self, ticks):
+        """Runs the given number of headless ticks"""
+        for _ in range(ticks):
+            self.step()
+
+    # ---------- State capture ----------
+    def fork(self):
+        """
+        Returns an independent copy of the simulation in the same state,
+        including its random state, so several strategies can continue
+        from an identical starting point. The dispatch settings auto_assign
+        and move_order carry over; the journal, observers and planning
+        service do not (snapshots do not store them).
+        """
+        from .snapshot import encode_snapshot, decode_snapshot
+        copy = decode_snapshot(encode_snapshot(self))
+        copy.auto_assign = self.auto_assign
+        copy.move_order = self.move_order
+        return copy
@@ -0,0 +1,392 @@
+"""
+Compact binary snapshots of a Simulation.
+
+Layout (little-endian, version 8):
+- header: magic, version, grid size, entity counts, tick, item interval
+- grid: one byte per cell (cell codes from grid.py), row by row
+- generators: position and the attributes of the item they hold
+- pending: indices of generators waiting for a robot
+- drop zones: position, received counter and name
+- robots: position, animation, state, targets, cargo, path and recovery stack
+- random state: the Mersenne Twister state of the simulation rng
+- traffic (version 2+): whether a heatmap is enabled, its parameters, scale and cell values
+- path repair (version 3+): whether routes are repaired incrementally, and every robot's goal
+  (planner searches are not stored; they are rebuilt on the next repair)
+- deadlocks (version 4+): resolver parameters and counters, and every robot's waiting and yielding state
+- robot streams (version 5+): whether robots have their own random streams, and their states
+- item stamps (version 6+): lifecycle ticks of the items on generators and robots, and the KPI
+  tracker (whether enabled, its counters and latency sketches); version 7 stores the KPI
+  tracker only
+- item ledger (version 7+): every column of the ledger, and the item ids held by generators
+  and robots (older snapshots get a ledger of the items in hand)
+- routes (version 8+): the parked-robot watch with its still counters, and the route index counters
+  (subscriptions are rebuilt from the robots' paths)
+"""
+import mmap
+import random
+import struct
+import sys
+from array import array
+
+from .dropzone import DropZone
+from .grid import Grid
+from .itemgenerator import ItemGenerator
+from .robot import Robot, FREE, PICKUP, DELIVERING
+from .simulation import Simulation
+from .traffic import TrafficHeatmap
+from .kpi import PHASES
+from .ledger import COLUMNS
+
+MAGIC = b"FWSN"
+FORMAT_VERSION = 8
+READABLE_VERSIONS = (1, 2, 3, 4, 5, 6, 7, 8)
+
+STATE_CODES = {FREE: 0, PICKUP: 1, DELIVERING: 2}
+STATE_NAMES = {code: name for name, code in STATE_CODES.items()}
+
+HEADER = struct.Struct("<4sHHHHHHIqI")
+GENERATOR = struct.Struct("<HHBddd")
+COUNT = struct.Struct("<I")
+INDEX = struct.Struct("<H")
+DROPZONE = struct.Struct("<HHQB")
+ROBOT = struct.Struct("<HHHddddBBBchhBdddII")
+RNG_HEADER = struct.Struct("<IIBd")
+TRAFFIC = struct.Struct("<Bdddd")
+FLAG = struct.Struct("<B")
+GOAL = struct.Struct("<hh")
+DEADLOCKS = struct.Struct("<BHHHHQQQQQQ")
+ROBOT_WAIT = struct.Struct("<HHBhhH")
+STAMPS = struct.Struct("<qqqq")
+KPIS = struct.Struct("<BdQ")
+SKETCH = struct.Struct("<QQqqB")
+ITEM_ID = struct.Struct("<q")
+ROUTES = struct.Struct("<HQQQ")
+
+
+def encode_snapshot(sim):
+    """Serializes the full state of a simulation into bytes"""
+    sim.flush_plans()  # Paths still waiting for the planning service are part of the state
+    grid = sim.grid
+    items = sim.items
+    gen_index = {id(g): i for i, g in enumerate(sim.generators)}
+    zone_index = {id(z): i for i, z in enumerate(sim.dropzones)}
+    out = bytearray(HEADER.pack(MAGIC, FORMAT_VERSION, grid.cols, grid.rows, grid.cell_size,
+                                len(sim.generators), len(sim.dropzones), len(sim.robots),
+                                sim.tick, sim.item_interval))
+
+    # Grid layer
+    out += grid.cells
+
+    # Generators and the items they hold
+    for g in sim.generators:
+        if g.item_id is None:
+            out += GENERATOR.pack(g.grid_x, g.grid_y, 0, 0.0, 0.0, 0.0)
+        else:
+            out += GENERATOR.pack(g.grid_x, g.grid_y, 1, *items.attributes(g.item_id))
+    out += COUNT.pack(len(sim.pending))
+    for g in sim.pending:
+        out += INDEX.pack(gen_index[id(g)])
+
+    # Drop zones
+    for z in sim.dropzones:
+        name = z.name.encode("utf-8")
+        out += DROPZONE.pack(z.grid_x, z.grid_y, z.items_received, len(name)) + name
+
+    # Robots
+    for r in sim.robots:
+        i = r.item_id
+        path = "".join(r.path).encode("ascii")
+        stack = "".join(r.recovery_stack).encode("ascii")
+        out += ROBOT.pack(
+            r.grid_x, r.grid_y, int(r.radius), r.x, r.y, r.target_x, r.target_y,
+            r.animating, r.in_collision_avoidance, STATE_CODES[r.state],
+            r.eye_direction.encode("ascii"),
+            gen_index[id(r.pickup_target)] if r.pickup_target is not None else -1,
+            zone_index[id(r.delivery_target)] if r.delivery_target is not None else -1,
+            i is not None, *(items.attributes(i) if i is not None else (0.0, 0.0, 0.0)),
+            len(path), len(stack))
+        out += path + stack
+
+    # Random state
+    out += _pack_rng(sim.rng)
+
+    # Traffic heatmap (raw values and scale, so forks plan exactly alike)
+    hm = sim.heatmap
+    if hm is None:
+        out += TRAFFIC.pack(0, 0.0, 0.0, 0.0, 0.0)
+    else:
+        out += TRAFFIC.pack(1, hm.decay, hm.fail_weight, hm.weight, hm.scale)
+        out += struct.pack(f"<{len(hm.heat)}d", *hm.heat)
+
+    # Incremental path repair
+    out += FLAG.pack(sim.path_repair)
+    for r in sim.robots:
+        out += GOAL.pack(*(r.goal if r.goal is not None else (-1, -1)))
+
+    # Deadlock resolution
+    dl = sim.deadlocks
+    if dl is None:
+        out += DEADLOCKS.pack(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+    else:
+        out += DEADLOCKS.pack(1, dl.wait_ticks, dl.escape_radius, dl.horizon, dl.hold_ticks, dl.deadlocks,
+                              dl.head_on, dl.resolved, dl.unresolved, dl.blocked_ticks, dl.yield_ticks)
+    for r in sim.robots:
+        (ex, ey), hold = r.escape if r.escape is not None else ((-1, -1), 0)
+        out += ROBOT_WAIT.pack(r.wait_ticks, r.blocked_ticks, r.escape is not None, ex, ey, hold)
+
+    # Per-robot random streams
+    out += FLAG.pack(sim.robot_streams)
+    if sim.robot_streams:
+        for r in sim.robots:
+            out += _pack_rng(r.rng)
+
+    # KPIs
+    kpis = sim.kpis
+    if kpis is None:
+        out += KPIS.pack(0, 0.0, 0)
+    else:
+        out += KPIS.pack(1, kpis.accuracy, kpis.ticks)
+        out += struct.pack(f"<{2 * len(sim.robots)}Q", *kpis.busy_ticks, *kpis.avoid_ticks)
+        for sketch in _kpi_sketches(kpis):
+            out += SKETCH.pack(sketch.count, sketch.total, sketch.min, sketch.max, sketch.buckets is not None)
+            if sketch.buckets is not None:
+                out += struct.pack(f"<{sketch.n_buckets}I", *sketch.buckets)
+
+    # Item ledger, column by column, and the ids held by generators and robots
+    out += COUNT.pack(items.count)
+    for name, _ in COLUMNS:
+        col = getattr(items, name)[:items.count]
+        if sys.byteorder != "little":
+            col.byteswap()
+        out += col.tobytes()
+    for i in [g.item_id for g in sim.generators] + [r.item_id for r in sim.robots]:
+        out += ITEM_ID.pack(i if i is not None else -1)
+
+    # Route index: parked-robot watch and counters
+    routes = sim.routes
+    out += ROUTES.pack(routes.park_ticks, routes.parked, routes.notified, routes.replanned)
+    if routes.park_ticks:
+        out += struct.pack(f"<{len(sim.robots)}I", *routes.still_ticks)
+    return bytes(out)
+
+
+def _kpi_sketches(kpis):
+    """Every latency sketch of a KpiTracker, in snapshot order"""
+    for group in [kpis.overall] + kpis.by_zone + kpis.by_generator + kpis.by_robot:
+        for phase in PHASES:
+            yield group[phase]
+
+
+def _pack_rng(rng):
+    version, words, gauss = rng.getstate()
+    return RNG_HEADER.pack(version, len(words), gauss is not None, gauss or 0.0) + \
+        struct.pack(f"<{len(words)}I", *words)
+
+
+def _unpack_rng(rng, view, pos):
+    """Restores a random state packed by _pack_rng(); returns the new position"""
+    version, n_words, has_gauss, gauss = RNG_HEADER.unpack_from(view, pos)
+    pos += RNG_HEADER.size
+    words = struct.unpack_from(f"<{n_words}I", view, pos)
+    rng.setstate((version, words, gauss if has_gauss else None))
+    return pos + 4 * n_words
+
+
+def decode_snapshot(buf):
+    """Rebuilds a Simulation from bytes (or any buffer) produced by encode_snapshot"""
+    with memoryview(buf) as view:
+        return _decode(view)
+
+
+def _decode(view):
+    magic, version, cols, rows, cell_size, n_gen, n_zone, n_robot, tick, item_interval = \
+        HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a warehouse snapshot")
+    if version not in READABLE_VERSIONS:
+        raise ValueError(f"Unsupported snapshot version {version}")
+    pos = HEADER.size
+
+    rng = random.Random()
+    grid = Grid(cols * cell_size, rows * cell_size, cell_size, bytearray(view[pos:pos + rows * cols]))
+    pos += rows * cols
+
+    generators = []
+    held = []  # (size, fragility, priority) of the items on generators and robots, or None
+    for _ in range(n_gen):
+        gx, gy, has_item, size, fragility, priority = GENERATOR.unpack_from(view, pos)
+        pos += GENERATOR.size
+        generators.append(ItemGenerator(gx, gy, grid, rng))
+        held.append((size, fragility, priority) if has_item else None)
+    (n_pending,) = COUNT.unpack_from(view, pos)
+    pos += COUNT.size
+    pending = []
+    for _ in range(n_pending):
+        pending.append(generators[INDEX.unpack_from(view, pos)[0]])
+        pos += INDEX.size
+
+    dropzones = []
+    for _ in range(n_zone):
+        zx, zy, received, name_len = DROPZONE.unpack_from(view, pos)
+        pos += DROPZONE.size
+        name = bytes(view[pos:pos + name_len]).decode("utf-8")
+        pos += name_len
+        z = DropZone(zx, zy, grid, name=name)
+        z.items_received = received
+        dropzones.append(z)
+
+    robots = []
+    for _ in range(n_robot):
+        (gx, gy, radius, x, y, tx, ty, animating, avoiding, state, eye, pickup, delivery,
+         has_item, size, fragility, priority, path_len, stack_len) = ROBOT.unpack_from(view, pos)
+        pos += ROBOT.size
+        r = Robot(gx, gy, radius, grid, rng)
+        r.x, r.y, r.target_x, r.target_y = x, y, tx, ty
+        r.animating = bool(animating)
+        r.in_collision_avoidance = bool(avoiding)
+        r.state = STATE_NAMES[state]
+        r.eye_direction = eye.decode("ascii")
+        r._update_eye_position()
+        r.pickup_target = generators[pickup] if pickup >= 0 else None
+        r.delivery_target = dropzones[delivery] if delivery >= 0 else None
+        held.append((size, fragility, priority) if has_item else None)
+        r.path = list(bytes(view[pos:pos + path_len]).decode("ascii"))
+        pos += path_len
+        r.recovery_stack = list(bytes(view[pos:pos + stack_len]).decode("ascii"))
+        pos += stack_len
+        robots.append(r)
+
+    # Restore the random state last: rebuilding the entities above must not disturb it
+    pos = _unpack_rng(rng, view, pos)
+
+    sim = Simulation(grid, generators, dropzones, robots, rng, item_interval)
+    if version >= 2:
+        has_heatmap, decay, fail_weight, weight, scale = TRAFFIC.unpack_from(view, pos)
+        pos += TRAFFIC.size
+        if has_heatmap:
+            hm = TrafficHeatmap(cols, rows, decay, fail_weight, weight)
+            hm.heat[:] = array("d", struct.unpack_from(f"<{rows * cols}d", view, pos))
+            hm.scale = scale
+            pos += 8 * rows * cols
+            sim.set_heatmap(hm)
+    if version >= 3:
+        (path_repair,) = FLAG.unpack_from(view, pos)
+        pos += FLAG.size
+        if path_repair:
+            sim.enable_path_repair()
+        for r in robots:
+            gx, gy = GOAL.unpack_from(view, pos)
+            pos += GOAL.size
+            r.goal = (gx, gy) if gx >= 0 else None
+    if version >= 4:
+        (has_resolver, wait_ticks, escape_radius, horizon, hold_ticks,
+         *counters) = DEADLOCKS.unpack_from(view, pos)
+        pos += DEADLOCKS.size
+        if has_resolver:
+            dl = sim.enable_deadlock_resolution(wait_ticks, escape_radius, horizon, hold_ticks)
+            (dl.deadlocks, dl.head_on, dl.resolved, dl.unresolved,
+             dl.blocked_ticks, dl.yield_ticks) = counters
+        for r in robots:
+            r.wait_ticks, r.blocked_ticks, escaping, ex, ey, hold = ROBOT_WAIT.unpack_from(view, pos)
+            pos += ROBOT_WAIT.size
+            r.escape = ((ex, ey), hold) if escaping else None
+    if version >= 5:
+        (robot_streams,) = FLAG.unpack_from(view, pos)
+        pos += FLAG.size
+        if robot_streams:
+            sim.robot_streams = True
+            for r in robots:
+                r.rng = random.Random()
+                pos = _unpack_rng(r.rng, view, pos)
+    stamps = [(-1, -1, -1, -1)] * len(held)
+    if version == 6:
+        stamps = list(STAMPS.iter_unpack(view[pos:pos + STAMPS.size * len(held)]))
+        pos += STAMPS.size * len(held)
+    if version >= 6:
+        has_kpis, accuracy, kpi_ticks = KPIS.unpack_from(view, pos)
+        pos += KPIS.size
+        if has_kpis:
+            kpis = sim.enable_kpis(accuracy)
+            kpis.ticks = kpi_ticks
+            counters = struct.unpack_from(f"<{2 * n_robot}Q", view, pos)
+            pos += 16 * n_robot
+            kpis.busy_ticks[:] = array("Q", counters[:n_robot])
+            kpis.avoid_ticks[:] = array("Q", counters[n_robot:])
+            for sketch in _kpi_sketches(kpis):
+                sketch.count, sketch.total, sketch.min, sketch.max, has_buckets = SKETCH.unpack_from(view, pos)
+                pos += SKETCH.size
+                if has_buckets:
+                    sketch.buckets = array("I", struct.unpack_from(f"<{sketch.n_buckets}I", view, pos))
+                    pos += 4 * sketch.n_buckets
+    if version >= 7:
+        items = sim.items
+        (n_items,) = COUNT.unpack_from(view, pos)
+        pos += COUNT.size
+        items.reserve(n_items)
+        for name, code in COLUMNS:
+            col = array(code)
+            col.frombytes(view[pos:pos + col.itemsize * n_items])
+            pos += col.itemsize * n_items
+            if sys.byteorder != "little":
+                col.byteswap()
+            getattr(items, name)[:n_items] = col
+        items.count = n_items
+        ids = [i if i >= 0 else None for (i,) in ITEM_ID.iter_unpack(view[pos:pos + ITEM_ID.size * len(held)])]
+        pos += ITEM_ID.size * len(held)
+        for g, i in zip(generators, ids):
+            g.item_id = i
+        for r, i in zip(robots, ids[n_gen:]):
+            r.item_id = i
+    else:
+        _ledger_from_held(sim, held, stamps)
+    if version >= 8:
+        routes = sim.routes
+        park_ticks, routes.parked, routes.notified, routes.replanned = ROUTES.unpack_from(view, pos)
+        pos += ROUTES.size
+        if park_ticks:
+            sim.enable_park_replanning(park_ticks)
+            routes.still_ticks[:] = array("I", struct.unpack_from(f"<{n_robot}I", view, pos))
+            pos += 4 * n_robot
+    sim.pending = pending
+    sim.tick = tick
+    return sim
+
+
+def _ledger_from_held(sim, held, stamps):
+    """Records the items in hand of an older snapshot (which has no ledger) in the simulation's ledger"""
+    items = sim.items
+    n_gen = len(sim.generators)
+    for gi, (g, attrs, (spawn, _, _, _)) in enumerate(zip(sim.generators, held, stamps)):
+        if attrs is not None:
+            g.item_id = items.add(*attrs, gi, spawn)
+    for r, attrs, (spawn, assign, pickup, _) in zip(sim.robots, held[n_gen:], stamps[n_gen:]):
+        if attrs is None:
+            continue
+        gen = r.pickup_target
+        if r.state == PICKUP and gen is not None and gen.item_id is not None:
+            # On its way to a pickup, a robot is in charge of the item still on the generator
+            r.item_id = gen.item_id
+        else:
+            r.item_id = items.add(*attrs, sim.generators.index(gen) if gen is not None else -1, spawn)
+        items.assign(r.item_id, r.id, assign)
+        if r.state == DELIVERING:
+            items.pickup(r.item_id, sim.dropzones.index(r.delivery_target), pickup)
+
+
+def save_snapshot(sim, path):
+    """Writes the state of a simulation to a snapshot file"""
+    with open(path, "wb") as f:
+        f.write(encode_snapshot(sim))
+
+
+def load_snapshot(path):
+    """Loads a snapshot file, memory-mapping it when the platform allows it"""
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            return decode_snapshot(f.read())
+    try:
+        return decode_snapshot(mm)
+    finally:
+        mm.close()
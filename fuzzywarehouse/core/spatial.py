@@ -0,0 +1,139 @@
+"""
+Uniform bucket index of robots over grid coordinates.
+
+The grid is split into square buckets of bucket_size cells. Robots are kept
+in the bucket of their cell, separately for each group (by default the robot
+state), so "nearest free robot" only looks at free robots. Queries visit
+buckets in rings around the query cell and stop as soon as no unvisited
+bucket can hold anything closer, which keeps them sub-linear in the fleet
+size. Distances are Manhattan distances, matching 4-way moves.
+"""
+
+
+class SpatialIndex:
+    def __init__(self, cols, rows, bucket_size=8, group=lambda robot: robot.state):
+        """
+        Initializes an empty index.
+
+        Parameters:
+        - cols, rows: size of the grid in cells
+        - bucket_size: side of a bucket in cells
+        - group: function giving the group of a robot (queries can filter on it)
+        """
+        self.bucket_size = bucket_size
+        self.bcols = (cols + bucket_size - 1) // bucket_size
+        self.brows = (rows + bucket_size - 1) // bucket_size
+        self.group = group
+        self._buckets = {}  # (group, bucket) -> list of robots
+        self._where = {}  # robot -> (x, y, group, bucket)
+        self._counts = {}  # group -> number of robots
+
+    def __len__(self):
+        return len(self._where)
+
+    def _bucket(self, x, y):
+        return (y // self.bucket_size) * self.bcols + x // self.bucket_size
+
+    def insert(self, robot):
+        """Adds a robot at its current cell"""
+        g = self.group(robot)
+        b = self._bucket(robot.grid_x, robot.grid_y)
+        self._where[robot] = (robot.grid_x, robot.grid_y, g, b)
+        self._buckets.setdefault((g, b), []).append(robot)
+        self._counts[g] = self._counts.get(g, 0) + 1
+
+    def remove(self, robot):
+        """Removes a robot from the index"""
+        _, _, g, b = self._where.pop(robot)
+        self._buckets[(g, b)].remove(robot)
+        self._counts[g] -= 1
+
+    def update(self, robot):
+        """Re-files a robot after it moved or changed group"""
+        x, y, g, b = self._where[robot]
+        ng = self.group(robot)
+        nb = self._bucket(robot.grid_x, robot.grid_y)
+        if ng == g and nb == b:
+            self._where[robot] = (robot.grid_x, robot.grid_y, g, b)
+            return
+        self.remove(robot)
+        self.insert(robot)
+
+    def at(self, x, y):
+        """Returns the robot standing on (x, y), or None"""
+        b = self._bucket(x, y)
+        for g in self._counts:
+            for robot in self._buckets.get((g, b), ()):
+                if robot.grid_x == x and robot.grid_y == y:
+                    return robot
+        return None
+
+    def _ring(self, bx, by, r):
+        """Bucket ids at Chebyshev distance r from bucket (bx, by)"""
+        if r == 0:
+            yield by * self.bcols + bx
+            return
+        for cx in range(max(0, bx - r), min(self.bcols - 1, bx + r) + 1):
+            if by - r >= 0:
+                yield (by - r) * self.bcols + cx
+            if by + r < self.brows:
+                yield (by + r) * self.bcols + cx
+        for cy in range(max(0, by - r + 1), min(self.brows - 1, by + r - 1) + 1):
+            if bx - r >= 0:
+                yield cy * self.bcols + bx - r
+            if bx + r < self.bcols:
+                yield cy * self.bcols + bx + r
+
+    def nearest(self, x, y, k=1, group=None, where=None, max_distance=None):
+        """
+        Returns up to k robots closest to (x, y), nearest first (ties broken by robot id).
+
+        Parameters:
+        - group: only consider robots of this group (e.g. FREE)
+        - where: optional extra predicate on the robot
+        - max_distance: ignore robots farther than this
+        """
+        if k <= 0:
+            return []
+        groups = list(self._counts) if group is None else [group]
+        total = sum(self._counts.get(g, 0) for g in groups)
+        bs = self.bucket_size
+        bx, by = x // bs, y // bs
+        found = []  # (distance, id, robot)
+        seen = 0
+        for r in range(max(self.bcols, self.brows)):
+            if max_distance is not None and r > 0 and (r - 1) * bs + 1 > max_distance:
+                break
+            for b in self._ring(bx, by, r):
+                for g in groups:
+                    for robot in self._buckets.get((g, b), ()):
+                        seen += 1
+                        d = abs(robot.grid_x - x) + abs(robot.grid_y - y)
+                        if max_distance is not None and d > max_distance:
+                            continue
+                        if where is None or where(robot):
+                            found.append((d, robot.id, robot))
+            # Buckets of the next ring are at least r * bs + 1 cells away
+            if seen >= total:
+                break
+            if len(found) >= k:
+                found.sort(key=lambda e: (e[0], e[1]))
+                if found[k - 1][0] <= r * bs:
+                    break
+        found.sort(key=lambda e: (e[0], e[1]))
+        return [robot for _, _, robot in found[:k]]
+
+    def within(self, x, y, radius, group=None):
+        """Returns the robots within Manhattan distance radius of (x, y), ordered by robot id"""
+        groups = list(self._counts) if group is None else [group]
+        bs = self.bucket_size
+        result = []
+        for by in range(max(0, (y - radius) // bs), min(self.brows - 1, (y + radius) // bs) + 1):
+            for bx in range(max(0, (x - radius) // bs), min(self.bcols - 1, (x + radius) // bs) + 1):
+                b = by * self.bcols + bx
+                for g in groups:
+                    for robot in self._buckets.get((g, b), ()):
+                        if abs(robot.grid_x - x) + abs(robot.grid_y - y) <= radius:
+                            result.append(robot)
+        result.sort(key=lambda robot: robot.id)
+        return result
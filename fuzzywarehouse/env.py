@@ -0,0 +1,235 @@
+"""
+Gym-style environments for training dispatch and routing policies.
+
+WarehouseEnv wraps one Simulation; VectorWarehouseEnv steps N independent
+warehouses in lockstep and returns stacked NumPy arrays, optionally spread
+across worker processes. Requires numpy.
+
+Observation (dict of arrays, a leading N axis in the vector env):
+- "grid":    uint8 (rows, cols) cell codes (see core/grid.py)
+- "robots":  int32 (n_robots, 6): x, y, state (0 FREE, 1 PICKUP, 2 DELIVERING),
+             remaining path length, carrying (0/1), in collision avoidance (0/1)
+- "items":   float32 (n_generators, 5): has item, size, fragility, priority, pending (0/1)
+
+Action: int array (n_robots, 2)
+- [:, 0] dispatch: generator index to send a FREE robot to, or -1
+- [:, 1] detour:   0 = normal move, 1..4 = step up/down/left/right instead
+  (replaces the random collision avoidance for that robot)
+
+Reward: items delivered during the step.
+"""
+import multiprocessing
+
+import numpy as np
+
+from .core.simulation import Simulation
+from .core.snapshot import STATE_CODES
+
+DETOURS = (None, 'u', 'd', 'l', 'r')
+ROBOT_FEATURES = 6
+ITEM_FEATURES = 5
+
+
+def default_sim(seed, width=640, height=480, cell_size=40, **kwargs):
+    """Builds a simulation with the default layout (picklable, for worker processes)"""
+    return Simulation.create(width, height, cell_size, seed=seed, **kwargs)
+
+
+class WarehouseEnv:
+    def __init__(self, make_sim=default_sim, max_ticks=2000, policy_dispatch=True, **sim_kwargs):
+        """
+        Initializes the environment.
+
+        Parameters:
+        - make_sim: function(seed, **sim_kwargs) returning a new Simulation
+        - max_ticks: episode length (the episode is truncated, never terminated)
+        - policy_dispatch: the policy assigns items; when False the built-in
+          nearest-free-robot dispatch runs and the dispatch column is ignored
+        - sim_kwargs: passed on to make_sim
+        """
+        self.make_sim = make_sim
+        self.sim_kwargs = sim_kwargs
+        self.max_ticks = max_ticks
+        self.policy_dispatch = policy_dispatch
+        self.sim = None
+        self.delivered = 0
+
+    def reset(self, seed=None):
+        """Starts a new episode; returns (observation, info)"""
+        self.sim = self.make_sim(seed, **self.sim_kwargs)
+        self.sim.auto_assign = not self.policy_dispatch
+        self.delivered = 0
+        return self.observe(), {"tick": 0}
+
+    def step(self, action):
+        """Applies an action; returns (observation, reward, terminated, truncated, info)"""
+        sim = self.sim
+        action = np.asarray(action)
+        if self.policy_dispatch:
+            for rid in np.flatnonzero(action[:, 0] >= 0):
+                g = int(action[rid, 0])
+                if g < len(sim.generators):
+                    sim.assign(sim.robots[rid], sim.generators[g])
+        detours = {int(rid): DETOURS[action[rid, 1]] for rid in np.flatnonzero(action[:, 1] > 0)}
+        sim.step(detours)
+        delivered = sum(z.items_received for z in sim.dropzones)
+        reward = float(delivered - self.delivered)
+        self.delivered = delivered
+        return self.observe(), reward, False, sim.tick >= self.max_ticks, {"tick": sim.tick}
+
+    def observe(self, out=None):
+        """Returns the observation, written into the arrays of `out` when given"""
+        sim = self.sim
+        if out is None:
+            out = empty_observation(sim)
+        out["grid"][...] = np.frombuffer(sim.grid.cells, dtype=np.uint8).reshape(sim.grid.rows, sim.grid.cols)
+        out["robots"][...] = [(r.grid_x, r.grid_y, STATE_CODES[r.state], len(r.path),
+                               r.item_id is not None, r.in_collision_avoidance) for r in sim.robots]
+        pending = set(map(id, sim.pending))
+        items = out["items"]
+        for i, g in enumerate(sim.generators):
+            if g.item_id is None:
+                items[i] = 0.0
+            else:
+                items[i] = (1.0, *sim.items.attributes(g.item_id), id(g) in pending)
+        return out
+
+
+def empty_observation(sim, n=None):
+    """Allocates observation arrays shaped for a simulation (with a leading axis of n if given)"""
+    lead = () if n is None else (n,)
+    return {
+        "grid": np.zeros(lead + (sim.grid.rows, sim.grid.cols), dtype=np.uint8),
+        "robots": np.zeros(lead + (len(sim.robots), ROBOT_FEATURES), dtype=np.int32),
+        "items": np.zeros(lead + (len(sim.generators), ITEM_FEATURES), dtype=np.float32),
+    }
+
+
+class _EnvBatch:
+    """A slice of environments stepped together (in-process or inside a worker)"""
+
+    def __init__(self, n, env_kwargs):
+        self.envs = [WarehouseEnv(**env_kwargs) for _ in range(n)]
+        self.obs = None
+        self.seeds = [None] * n  # Seed of each environment's first episode
+        self.stride = 0  # Added to an environment's seed for each later episode
+        self.episodes = [0] * n
+
+    def reset(self, seeds, stride):
+        self.seeds = list(seeds)
+        self.stride = stride
+        self.episodes = [0] * len(self.envs)
+        for env, seed in zip(self.envs, seeds):
+            env.reset(seed)
+        self.obs = empty_observation(self.envs[0].sim, len(self.envs))
+        return self._stack()
+
+    def step(self, actions):
+        n = len(self.envs)
+        rewards = np.zeros(n, dtype=np.float32)
+        truncated = np.zeros(n, dtype=bool)
+        for i, env in enumerate(self.envs):
+            _, rewards[i], _, truncated[i], _ = env.step(actions[i])
+            if truncated[i]:
+                # Auto-reset, as vector environments do, on the next seed of this environment
+                self.episodes[i] += 1
+                seed = self.seeds[i]
+                env.reset(None if seed is None else seed + self.stride * self.episodes[i])
+        return self._stack(), rewards, truncated
+
+    def _stack(self):
+        for i, env in enumerate(self.envs):
+            env.observe({k: v[i] for k, v in self.obs.items()})
+        return self.obs
+
+
+def _worker(conn, n, env_kwargs):
+    batch = _EnvBatch(n, env_kwargs)
+    while True:
+        cmd, arg = conn.recv()
+        if cmd == "reset":
+            conn.send(batch.reset(*arg))
+        elif cmd == "step":
+            conn.send(batch.step(arg))
+        else:
+            conn.close()
+            return
+
+
+class VectorWarehouseEnv:
+    def __init__(self, n, processes=0, **env_kwargs):
+        """
+        Initializes N independent warehouses.
+
+        Parameters:
+        - n: number of environments
+        - processes: 0 steps all environments in this process; otherwise they
+          are split into contiguous slices across that many worker processes
+          (make_sim must then be picklable, e.g. a module-level function)
+        - env_kwargs: passed to every WarehouseEnv
+        """
+        self.n = n
+        self.processes = min(processes, n)
+        if self.processes:
+            sizes = [n // self.processes + (i < n % self.processes) for i in range(self.processes)]
+            self.slices = []
+            self.conns = []
+            self.workers = []
+            start = 0
+            for size in sizes:
+                parent, child = multiprocessing.Pipe()
+                proc = multiprocessing.Process(target=_worker, args=(child, size, env_kwargs), daemon=True)
+                proc.start()
+                child.close()
+                self.conns.append(parent)
+                self.workers.append(proc)
+                self.slices.append(slice(start, start + size))
+                start += size
+        else:
+            self.batch = _EnvBatch(n, env_kwargs)
+
+    def reset(self, seed=None):
+        """
+        Resets every environment; returns stacked observations.
+
+        Environment i gets seed + i, and its automatic resets continue with
+        seed + i + n, seed + i + 2n, ..., so a seeded run is reproducible
+        across episodes.
+        """
+        seeds = [None if seed is None else seed + i for i in range(self.n)]
+        if not self.processes:
+            return {k: v.copy() for k, v in self.batch.reset(seeds, self.n).items()}
+        for conn, sl in zip(self.conns, self.slices):
+            conn.send(("reset", (seeds[sl], self.n)))
+        return self._concat([conn.recv() for conn in self.conns])
+
+    def step(self, actions):
+        """
+        Steps every environment with actions of shape (n, n_robots, 2).
+
+        Returns (observations, rewards, terminated, truncated); truncated
+        environments are reset automatically.
+        """
+        actions = np.asarray(actions)
+        if not self.processes:
+            obs, rewards, truncated = self.batch.step(actions)
+            obs = {k: v.copy() for k, v in obs.items()}
+        else:
+            for conn, sl in zip(self.conns, self.slices):
+                conn.send(("step", actions[sl]))
+            results = [conn.recv() for conn in self.conns]
+            obs = self._concat([r[0] for r in results])
+            rewards = np.concatenate([r[1] for r in results])
+            truncated = np.concatenate([r[2] for r in results])
+        return obs, rewards, np.zeros(self.n, dtype=bool), truncated
+
+    @staticmethod
+    def _concat(parts):
+        return {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+
+    def close(self):
+        if self.processes:
+            for conn in self.conns:
+                conn.send(("close", None))
+            for proc in self.workers:
+                proc.join()
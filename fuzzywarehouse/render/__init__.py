@@ -0,0 +1,4 @@
+"""
+Drawing with pygame: draw renders frames, capture records or streams them.
+Import the modules directly; the core never imports this package.
+"""
@@ -0,0 +1,196 @@
+"""
+Rendering observers.
+
+An observer is attached with Simulation.add_observer() and called after
+every tick. It draws every Nth tick only. On the engine thread it copies
+what draw.draw_frame() reads (frame_state(): grid cells, heat, robot
+poses, states and targets, the attributes of held items, zone counters),
+so the cost of a frame depends on the floor and the fleet, not on how long
+the run has been going, and draws from that copy. With threaded=True
+the drawing happens on a background thread while the engine runs on. When
+the drawing falls behind, the engine waits for it (recorders, so no frame
+is lost) or the oldest pending frames are dropped (drop=True, for live
+viewing that must never slow the engine).
+
+- WindowViewer: shows frames in the pygame window
+- FrameArchive: headless capture of frames into a zip archive of PNG images
+- VideoWriter: headless capture piped to ffmpeg through pygame.surfarray
+
+Like draw.py, this module imports pygame; the simulation core does not.
+"""
+import io
+import queue
+import subprocess
+import threading
+import zipfile
+from array import array
+from types import SimpleNamespace
+
+import pygame
+import pygame.surfarray
+
+from . import draw
+from ..core.grid import Grid
+from ..core.traffic import TrafficHeatmap
+
+
+class _HeldItems:
+    """Attributes of the items on generators and robots, read like an ItemLedger"""
+
+    def __init__(self, items, ids):
+        self._attributes = {i: items.attributes(i) for i in ids if i is not None}
+
+    def attributes(self, i):
+        return self._attributes[i]
+
+
+def frame_state(sim):
+    """
+    Copies the state draw.draw_frame() reads from a simulation into a
+    lightweight stand-in for it (no item history, no planners)
+    """
+    src = sim.grid
+    grid = Grid(src.width, src.height, src.cell_size, bytearray(src.cells))
+    heatmap = None
+    if sim.heatmap is not None:
+        heatmap = TrafficHeatmap(grid.cols, grid.rows)
+        heatmap.heat = array('d', sim.heatmap.heat)
+        heatmap.scale = sim.heatmap.scale
+    generators = {g: SimpleNamespace(x=g.x, y=g.y, grid=grid, item_id=g.item_id) for g in sim.generators}
+    zones = {z: SimpleNamespace(x=z.x, y=z.y, grid=grid, name=z.name, items_received=z.items_received)
+             for z in sim.dropzones}
+    robots = [SimpleNamespace(x=r.x, y=r.y, radius=r.radius, state=r.state, eye_x=r.eye_x, eye_y=r.eye_y,
+                              eye_radius=r.eye_radius, item_id=r.item_id,
+                              pickup_target=generators.get(r.pickup_target),
+                              delivery_target=zones.get(r.delivery_target))
+              for r in sim.robots]
+    held = [g.item_id for g in sim.generators] + [r.item_id for r in sim.robots]
+    return SimpleNamespace(grid=grid, heatmap=heatmap, generators=list(generators.values()),
+                           dropzones=list(zones.values()), robots=robots, items=_HeldItems(sim.items, held))
+
+
+class FrameObserver:
+    def __init__(self, every=1, threaded=False, backlog=4, drop=False):
+        """
+        Initializes the observer.
+
+        Parameters:
+        - every: draw one frame every this many ticks
+        - threaded: draw on a background thread instead of the engine thread
+        - backlog: frames that may wait for the drawing thread
+        - drop: when the backlog is full, drop the oldest frame instead of waiting
+        """
+        pygame.font.init()  # Enough for offscreen drawing; no display is needed
+        self.every = every
+        self.drop = drop
+        self.frames = 0  # Frames drawn
+        self.dropped = 0  # Frames skipped because the drawing thread fell behind
+        self.surface = pygame.Surface((draw.SCREEN_WIDTH, draw.SCREEN_HEIGHT))
+        self._queue = None
+        self._thread = None
+        if threaded:
+            self._queue = queue.Queue(backlog)
+            self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+            self._thread.start()
+
+    def on_tick(self, sim):
+        """Called by the simulation after every tick"""
+        if sim.tick % self.every:
+            return
+        state = (sim.tick, frame_state(sim))
+        if self._queue is None:
+            self._draw(*state)
+            return
+        if not self.drop:
+            self._queue.put(state)
+            return
+        while True:
+            try:
+                self._queue.put_nowait(state)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def _run(self):
+        while True:
+            state = self._queue.get()
+            if state is None:
+                return
+            self._draw(*state)
+
+    def _draw(self, tick, state):
+        draw.draw_frame(self.surface, state)
+        self.consume(self.surface, tick)
+        self.frames += 1
+
+    def consume(self, surface, tick):
+        """Does something with a drawn frame (overridden by subclasses)"""
+
+    def close(self):
+        """Draws the frames still pending and releases the observer's resources"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+
+class WindowViewer(FrameObserver):
+    """
+    Shows every Nth tick in the pygame window. Keep threaded=False: most
+    platforms only allow the main thread to update the window.
+    """
+
+    def __init__(self, screen, every=1):
+        super().__init__(every)
+        self.screen = screen
+        self.closed = False  # Set when the window was closed
+
+    def consume(self, surface, tick):
+        self.screen.blit(surface, (0, 0))
+        pygame.display.flip()
+        for e in pygame.event.get():
+            if e.type == pygame.QUIT:
+                self.closed = True
+
+
+class FrameArchive(FrameObserver):
+    """Saves every Nth tick as frame_<tick>.png into a zip archive"""
+
+    def __init__(self, path, every=10, threaded=True, backlog=4, drop=False):
+        super().__init__(every, threaded, backlog, drop)
+        # PNG data is already compressed, so the archive only stores it
+        self.archive = zipfile.ZipFile(path, "w", zipfile.ZIP_STORED)
+
+    def consume(self, surface, tick):
+        data = io.BytesIO()
+        pygame.image.save(surface, data, "png")
+        self.archive.writestr(f"frame_{tick:08d}.png", data.getvalue())
+
+    def close(self):
+        super().close()
+        self.archive.close()
+
+
+class VideoWriter(FrameObserver):
+    """Encodes every Nth tick into a video by piping raw RGB frames to ffmpeg"""
+
+    def __init__(self, path, every=1, fps=30, threaded=True, backlog=4, drop=False, ffmpeg="ffmpeg"):
+        super().__init__(every, threaded, backlog, drop)
+        w, h = self.surface.get_size()
+        self.process = subprocess.Popen(
+            [ffmpeg, "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgb24",
+             "-s", f"{w}x{h}", "-r", str(fps), "-i", "-", "-pix_fmt", "yuv420p", path],
+            stdin=subprocess.PIPE)
+
+    def consume(self, surface, tick):
+        # surfarray is indexed [x][y]; video rows are y first
+        self.process.stdin.write(pygame.surfarray.array3d(surface).swapaxes(0, 1).tobytes())
+
+    def close(self):
+        super().close()
+        self.process.stdin.close()
+        self.process.wait()
@@ -0,0 +1,270 @@
+"""
+Pygame drawing for the simulation.
+
+Only this module and the frame observers of capture.py import pygame; the
+simulation core stays importable (and cheap to import) in processes that
+never draw anything.
+"""
+import pygame
+
+from ..core.robot import FREE, PICKUP, DELIVERING
+from ..core.grid import OBSTACLE
+from ..core.simulation import GRID_WIDTH, GRID_HEIGHT
+
+# Window layout (the floor size comes from simulation.py)
+SCREEN_WIDTH, SCREEN_HEIGHT = 960, 640  # Reduced from 1200x800
+INFO_PANEL_WIDTH = 160  # Reduced from 200
+BOTTOM_PANEL_HEIGHT = 160  # Reduced from 200
+
+# Color definitions (RGB)
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+BROWN = (139, 69, 19)
+LIGHT_GRAY = (220, 220, 220)
+DARK_GRAY = (100, 100, 100)
+GRAY = (128, 128, 128)
+GREEN = (0, 255, 0)  # Items and FREE robots
+ORANGE = (255, 165, 0)  # PICKUP
+RED = (255, 0, 0)  # DELIVERING
+BLUE = (0, 0, 255)  # Drop zones
+
+
+def draw_grid(s, grid):
+    """Draws the grid lines and the obstacles"""
+    for x in range(0, grid.width + 1, grid.cell_size):
+        pygame.draw.line(s, BLACK, (x, 0), (x, grid.height))
+    for y in range(0, grid.height + 1, grid.cell_size):
+        pygame.draw.line(s, BLACK, (0, y), (grid.width, y))
+    for y in range(grid.rows):
+        for x in range(grid.cols):
+            if grid.get(x, y) == OBSTACLE:
+                pygame.draw.rect(s, BROWN,
+                                 (x * grid.cell_size, y * grid.cell_size,
+                                  grid.cell_size, grid.cell_size))
+
+
+def draw_heatmap(s, grid, heatmap, max_alpha=160):
+    """Overlays the traffic heatmap as translucent red cells (strongest on the hottest cell)"""
+    rows = heatmap.to_rows()
+    top = max((v for row in rows for v in row), default=0.0)
+    if top <= 0:
+        return
+    overlay = pygame.Surface((grid.width, grid.height), pygame.SRCALPHA)
+    for y, row in enumerate(rows):
+        for x, v in enumerate(row):
+            if v > 0:
+                overlay.fill((255, 0, 0, int(max_alpha * v / top)),
+                             (x * grid.cell_size, y * grid.cell_size, grid.cell_size, grid.cell_size))
+    s.blit(overlay, (0, 0))
+
+
+def draw_item(screen, gen):
+    """Draws the item held by a generator as a small green circle centered in its cell"""
+    cs = gen.grid.cell_size
+    pygame.draw.circle(screen, GREEN, (gen.x + cs / 2, gen.y + cs / 2), cs // 6)
+
+
+def draw_generator(screen, gen):
+    """Draws the generator as a black square and the item it holds (if any)"""
+    pygame.draw.rect(screen, BLACK,
+                     (gen.x, gen.y, gen.grid.cell_size, gen.grid.cell_size))
+    if gen.item_id is not None:
+        draw_item(screen, gen)
+
+
+def draw_dropzone(screen, zone):
+    """Draws the drop zone as a blue square with its name in the center"""
+    pygame.draw.rect(screen, BLUE,
+                     (zone.x, zone.y, zone.grid.cell_size, zone.grid.cell_size))
+    if zone.name:
+        font = pygame.font.SysFont('Arial', 14)  # Create a font for the text
+        text = font.render(zone.name, True, WHITE)  # Render the name in white
+        text_rect = text.get_rect(center=(zone.x + zone.grid.cell_size // 2,
+                                          zone.y + zone.grid.cell_size // 2))  # Center the text
+        screen.blit(text, text_rect)  # Draw the name on the screen
+
+
+def draw_robot(screen, robot):
+    """Draws the robot body, a hat colored by its state and its eye"""
+    pygame.draw.circle(screen, GRAY, (int(robot.x), int(robot.y)), robot.radius)
+    # Draw hat to indicate robot state
+    if robot.state == FREE:
+        hat = GREEN
+    elif robot.state == PICKUP:
+        hat = ORANGE
+    else:
+        hat = RED
+    hw, hh = robot.radius * 1.2, robot.radius * 0.5
+    pygame.draw.rect(
+        screen,
+        hat,
+        (robot.x - hw / 2, robot.y - robot.radius - hh, hw, hh)
+    )
+
+    # Draw the eye
+    pygame.draw.circle(screen, BLACK, (int(robot.eye_x), int(robot.eye_y)), int(robot.eye_radius))
+
+
+def draw_info_panels(screen, generators, dropzones, items):
+    """Draw information panels for generators and dropzones"""
+    # Left panel (Generators)
+    pygame.draw.rect(screen, LIGHT_GRAY, (0, 0, INFO_PANEL_WIDTH, GRID_HEIGHT))
+    pygame.draw.line(screen, BLACK, (INFO_PANEL_WIDTH, 0), (INFO_PANEL_WIDTH, GRID_HEIGHT), 2)
+
+    # Right panel (Dropzones)
+    pygame.draw.rect(screen, LIGHT_GRAY, (INFO_PANEL_WIDTH + GRID_WIDTH, 0, INFO_PANEL_WIDTH, GRID_HEIGHT))
+    pygame.draw.line(screen, BLACK, (INFO_PANEL_WIDTH + GRID_WIDTH, 0),
+                     (INFO_PANEL_WIDTH + GRID_WIDTH, GRID_HEIGHT), 2)
+
+    # Draw panel titles with slightly smaller fonts
+    font_title = pygame.font.SysFont('Arial', 19, bold=True)  # Reduced from 20
+    font_regular = pygame.font.SysFont('Arial', 15)  # Reduced from 16
+    font_small = pygame.font.SysFont('Arial', 13)  # Reduced from 14
+
+    # Generators panel title
+    title = font_title.render("Item Generators", True, BLACK)
+    screen.blit(title, (10, 10))
+
+    # Draw info for each generator
+    for i, gen in enumerate(generators):
+        y_pos = 50 + i * 100  # Reduced spacing from 120
+
+        # Generator label
+        gen_label = font_regular.render(f"Generator {i + 1}", True, BLACK)
+        screen.blit(gen_label, (10, y_pos))
+
+        # Draw separator line
+        pygame.draw.line(screen, DARK_GRAY, (10, y_pos + 25), (INFO_PANEL_WIDTH - 10, y_pos + 25), 1)
+
+        # Item info
+        if gen.item_id is not None:
+            size, fragility, priority = items.attributes(gen.item_id)
+            item_text = font_regular.render("Current Item:", True, BLACK)
+            screen.blit(item_text, (10, y_pos + 35))
+
+            # Item attributes
+            size_text = font_small.render(f"Size: {size}", True, BLACK)
+            screen.blit(size_text, (20, y_pos + 55))  # Reduced from 60
+
+            frag_text = font_small.render(f"Fragility: {fragility}", True, BLACK)
+            screen.blit(frag_text, (20, y_pos + 70))  # Reduced from 80
+
+            prio_text = font_small.render(f"Priority: {priority}", True, BLACK)
+            screen.blit(prio_text, (20, y_pos + 85))  # Reduced from 100
+        else:
+            no_item = font_regular.render("No item", True, BLACK)
+            screen.blit(no_item, (10, y_pos + 55))  # Adjusted
+
+    # Dropzones panel title
+    title = font_title.render("Delivery Zones", True, BLACK)
+    screen.blit(title, (INFO_PANEL_WIDTH + GRID_WIDTH + 10, 10))
+
+    # Draw info for each dropzone
+    for i, zone in enumerate(dropzones):
+        y_pos = 50 + i * 70  # Reduced from 80
+
+        # Zone label
+        zone_label = font_regular.render(f"Zone {zone.name}", True, BLACK)
+        screen.blit(zone_label, (INFO_PANEL_WIDTH + GRID_WIDTH + 10, y_pos))
+
+        # Draw separator line
+        pygame.draw.line(screen, DARK_GRAY,
+                         (INFO_PANEL_WIDTH + GRID_WIDTH + 10, y_pos + 25),
+                         (SCREEN_WIDTH - 10, y_pos + 25), 1)
+
+        # Items received
+        items_text = font_regular.render(f"Items received: {zone.items_received}", True, BLACK)
+        screen.blit(items_text, (INFO_PANEL_WIDTH + GRID_WIDTH + 10, y_pos + 40))
+
+
+def draw_robot_panel(screen, robots, generators, items):
+    """Draw information panel for robots at the bottom of the screen"""
+    # Bottom panel background
+    pygame.draw.rect(screen, LIGHT_GRAY, (0, GRID_HEIGHT, SCREEN_WIDTH, BOTTOM_PANEL_HEIGHT))
+    pygame.draw.line(screen, BLACK, (0, GRID_HEIGHT), (SCREEN_WIDTH, GRID_HEIGHT), 2)
+
+    # Fonts
+    font_title = pygame.font.SysFont('Arial', 19, bold=True)  # Reduced from 20
+    font_regular = pygame.font.SysFont('Arial', 15)  # Reduced from 16
+    font_small = pygame.font.SysFont('Arial', 13)  # Reduced from 14
+
+    # Panel title
+    title = font_title.render("Robot Status", True, BLACK)
+    screen.blit(title, (10, GRID_HEIGHT + 10))
+
+    # Draw info for each robot
+    robot_width = SCREEN_WIDTH // len(robots) if robots else SCREEN_WIDTH
+
+    for i, robot in enumerate(robots):
+        x_pos = i * robot_width
+        y_pos = GRID_HEIGHT + 35  # Reduced from 40
+
+        # Robot section border
+        pygame.draw.line(screen, DARK_GRAY, (x_pos, GRID_HEIGHT), (x_pos, SCREEN_HEIGHT), 1)
+
+        # Robot label
+        robot_label = font_regular.render(f"Robot {i + 1}", True, BLACK)
+        screen.blit(robot_label, (x_pos + 10, y_pos))
+
+        # Status line (FREE/PICKUP/DELIVERING)
+        state_text = font_regular.render(f"Status: {robot.state}", True, BLACK)
+        screen.blit(state_text, (x_pos + 10, y_pos + 20))  # Reduced from 25
+
+        # Target information
+        target_text = "Target: "
+        if robot.state == PICKUP and robot.pickup_target:
+            # Find generator index
+            gen_index = next((i + 1 for i, g in enumerate(generators)
+                              if g == robot.pickup_target), "?")
+            target_text += f"Generator {gen_index}"
+        elif robot.state == DELIVERING and robot.delivery_target:
+            target_text += f"Zone {robot.delivery_target.name}"
+        else:
+            target_text += "No target"
+
+        target_render = font_regular.render(target_text, True, BLACK)
+        screen.blit(target_render, (x_pos + 10, y_pos + 40))  # Reduced from 50
+
+        # Item information if carrying one
+        if robot.item_id is not None:
+            size, fragility, priority = items.attributes(robot.item_id)
+            item_title = font_regular.render("Carrying Item:", True, BLACK)
+            screen.blit(item_title, (x_pos + 10, y_pos + 60))  # Reduced from 75
+
+            size_text = font_small.render(f"Size: {size:.2f}", True, BLACK)
+            screen.blit(size_text, (x_pos + 15, y_pos + 80))  # Reduced from 100
+
+            frag_text = font_small.render(f"Fragility: {fragility:.2f}", True, BLACK)
+            screen.blit(frag_text, (x_pos + 15, y_pos + 95))  # Reduced from 120
+
+            prio_text = font_small.render(f"Priority: {priority:.2f}", True, BLACK)
+            screen.blit(prio_text, (x_pos + 15, y_pos + 110))  # Reduced from 140
+        else:
+            no_item = font_regular.render("Not carrying an item", True, BLACK)
+            screen.blit(no_item, (x_pos + 10, y_pos + 60))  # Adjusted
+
+
+def draw_frame(screen, sim):
+    """Draws the panels, the grid and every entity of a simulation"""
+    screen.fill(WHITE)
+
+    # Draw info panels
+    draw_info_panels(screen, sim.generators, sim.dropzones, sim.items)
+
+    # Draw grid with offset for the left panel
+    area = pygame.Surface.subsurface(screen, (INFO_PANEL_WIDTH, 0, GRID_WIDTH, GRID_HEIGHT))
+    area.fill(WHITE)
+    draw_grid(area, sim.grid)
+    if sim.heatmap is not None:
+        draw_heatmap(area, sim.grid, sim.heatmap)
+
+    # Draw game elements with offset
+    for g in sim.generators:
+        draw_generator(area, g)
+    for z in sim.dropzones:
+        draw_dropzone(area, z)
+    for r in sim.robots:
+        draw_robot(area, r)
+
+    # Draw the robot info panel at the bottom
+    draw_robot_panel(screen, sim.robots, sim.generators, sim.items)
@@ -0,0 +1,263 @@
+"""
+Local asyncio control server.
+
+External fleet-management software or test harnesses drive a Simulation
+over a Unix socket or localhost TCP. Every message is a frame: a 4-byte
+big-endian length followed by compact JSON.
+
+Request:  {"id": 7, "cmds": [[name, args...], ...]}
+Response: {"id": 7, "tick": 120, "results": [...]}
+
+All commands of a request are applied in order within the same tick, so a
+controller can assign hundreds of robots, inject items and step the
+simulation in one round trip. Commands:
+- ["step", n]                             advance n ticks (default 1)
+- ["assign", robot, generator]            send a free robot to a waiting item
+- ["inject", generator, size, fragility, priority]
+- ["observe"] / ["observe", "full"]       state changes since this client's last observe
+A malformed or unknown command gets {"error": ...} as its result; a request
+that is not an object with a list of commands gets {"id": ..., "error": ...}.
+
+Observations are deltas with flat integer arrays, one record per changed entity:
+- "robots":     [id, x, y, state, path length, carrying (0/1), ...]   (5+1 ints each)
+- "generators": [index, has item, size%, fragility%, priority%, ...]  (attributes x100)
+- "zones":      [index, items received, ...]
+- "pending":    generator indices waiting for a robot (sent when changed)
+"""
+import argparse
+import asyncio
+import json
+import struct
+
+from .core.snapshot import STATE_CODES
+
+FRAME = struct.Struct(">I")
+MAX_FRAME = 16 * 1024 * 1024
+ROBOT_FIELDS = 6
+
+
+async def read_frame(reader):
+    """Reads one frame and returns the decoded JSON, or None at end of stream"""
+    try:
+        header = await reader.readexactly(FRAME.size)
+    except asyncio.IncompleteReadError:
+        return None
+    (size,) = FRAME.unpack(header)
+    if size > MAX_FRAME:
+        raise ValueError(f"Frame of {size} bytes exceeds the limit")
+    return json.loads(await reader.readexactly(size))
+
+
+def encode_frame(message):
+    """Encodes a message as a length-prefixed compact JSON frame"""
+    body = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    return FRAME.pack(len(body)) + body
+
+
+class Session:
+    """Per-connection state: what this client has already observed"""
+
+    def __init__(self):
+        self.robots = {}
+        self.generators = {}
+        self.zones = {}
+        self.pending = None
+
+
+class ControlServer:
+    def __init__(self, sim, auto_assign=True):
+        """
+        Initializes the server.
+
+        Parameters:
+        - sim: the Simulation to control
+        - auto_assign: keep the built-in nearest-free-robot dispatch in step();
+          turn off when the controller assigns every item itself
+        """
+        self.sim = sim
+        sim.auto_assign = auto_assign
+        self.server = None
+        self.commands = {
+            "step": self._step,
+            "assign": self._assign,
+            "inject": self._inject,
+            "observe": self._observe,
+        }
+
+    async def start(self, path=None, host="127.0.0.1", port=0):
+        """Starts listening on a Unix socket (path) or on localhost TCP; returns the address"""
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self._handle, path=path)
+            return path
+        self.server = await asyncio.start_server(self._handle, host, port)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        session = Session()
+        try:
+            while True:
+                try:
+                    request = await read_frame(reader)
+                except (ValueError, json.JSONDecodeError) as e:
+                    writer.write(encode_frame({"error": str(e)}))
+                    break
+                if request is None:
+                    break
+                if not isinstance(request, dict) or not isinstance(request.get("cmds", []), list):
+                    request_id = request.get("id") if isinstance(request, dict) else None
+                    writer.write(encode_frame({"id": request_id, "error": 'request must be an object with a "cmds" list'}))
+                    await writer.drain()
+                    continue
+                # Commands run synchronously: no other client can interleave within a batch
+                results = self.execute(request.get("cmds", []), session)
+                writer.write(encode_frame({"id": request.get("id"), "tick": self.sim.tick, "results": results}))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def execute(self, cmds, session):
+        """Applies a batch of commands and returns one result per command"""
+        results = []
+        for cmd in cmds:
+            if not isinstance(cmd, list) or not cmd or not isinstance(cmd[0], str):
+                results.append({"error": f"malformed command {cmd!r}, expected [name, args...]"})
+                continue
+            if cmd[0] not in self.commands:
+                results.append({"error": f"unknown command {cmd!r}"})
+                continue
+            try:
+                results.append(self.commands[cmd[0]](session, *cmd[1:]))
+            except (TypeError, ValueError, IndexError) as e:
+                results.append({"error": f"{cmd[0]}: {e}"})
+        return results
+
+    # ---------- Commands ----------
+    def _step(self, session, n=1):
+        for _ in range(int(n)):
+            self.sim.step()
+        return self.sim.tick
+
+    def _assign(self, session, robot, generator):
+        sim = self.sim
+        if not (0 <= robot < len(sim.robots) and 0 <= generator < len(sim.generators)):
+            raise IndexError("no such robot or generator")
+        return sim.assign(sim.robots[robot], sim.generators[generator])
+
+    def _inject(self, session, generator, size, fragility, priority):
+        sim = self.sim
+        if not 0 <= generator < len(sim.generators):
+            raise IndexError("no such generator")
+        for v in (size, fragility, priority):
+            if not 0.0 <= v <= 1.0:
+                raise ValueError("attributes must be in [0, 1]")
+        return sim.inject_item(sim.generators[generator], size, fragility, priority)
+
+    def _observe(self, session, mode="delta"):
+        if mode == "full":
+            session.__init__()
+        sim = self.sim
+        robots, generators, zones = [], [], []
+        for r in sim.robots:
+            rec = (r.grid_x, r.grid_y, STATE_CODES[r.state], len(r.path), int(r.item_id is not None))
+            if session.robots.get(r.id) != rec:
+                session.robots[r.id] = rec
+                robots.append(r.id)
+                robots.extend(rec)
+        for i, g in enumerate(sim.generators):
+            if g.item_id is None:
+                rec = (0, 0, 0, 0)
+            else:
+                rec = (1, *(round(v * 100) for v in sim.items.attributes(g.item_id)))
+            if session.generators.get(i) != rec:
+                session.generators[i] = rec
+                generators.append(i)
+                generators.extend(rec)
+        for i, z in enumerate(sim.dropzones):
+            if session.zones.get(i) != z.items_received:
+                session.zones[i] = z.items_received
+                zones.extend((i, z.items_received))
+        delta = {"robots": robots, "generators": generators, "zones": zones}
+        pending = [sim.generators.index(g) for g in sim.pending]
+        if pending != session.pending:
+            session.pending = pending
+            delta["pending"] = pending
+        return delta
+
+
+class ControlClient:
+    """Minimal client for the control protocol (also a stand-in controller for tests)"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.next_id = 0
+
+    @classmethod
+    async def connect(cls, path=None, host="127.0.0.1", port=None):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, *cmds):
+        """Sends a batch of commands and returns the response"""
+        self.next_id += 1
+        self.writer.write(encode_frame({"id": self.next_id, "cmds": [list(c) for c in cmds]}))
+        await self.writer.drain()
+        return await read_frame(self.reader)
+
+    async def step(self, n=1):
+        return (await self.request(("step", n)))["results"][0]
+
+    async def observe(self, full=False):
+        return (await self.request(("observe", "full") if full else ("observe",)))["results"][0]
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+def decode_robots(flat):
+    """Splits a flat robot array into {id: (x, y, state, path length, carrying)}"""
+    return {flat[i]: tuple(flat[i + 1:i + ROBOT_FIELDS]) for i in range(0, len(flat), ROBOT_FIELDS)}
+
+
+async def serve(sim, path=None, host="127.0.0.1", port=8765, auto_assign=True):
+    """Runs a control server until cancelled"""
+    server = ControlServer(sim, auto_assign)
+    address = await server.start(path, host, port)
+    print(f"Control server listening on {address}")
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main():
+    from .core.simulation import Simulation
+
+    parser = argparse.ArgumentParser(description="Serve a headless warehouse simulation")
+    parser.add_argument("--unix", help="Unix socket path (default: localhost TCP)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--robots", type=int, default=4)
+    parser.add_argument("--external-dispatch", action="store_true",
+                        help="do not assign items automatically; the controller sends assign commands")
+    args = parser.parse_args()
+    sim = Simulation.create(640, 480, 40, n_robots=args.robots, seed=args.seed)
+    try:
+        asyncio.run(serve(sim, args.unix, port=args.port, auto_assign=not args.external_dispatch))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()